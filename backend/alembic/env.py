@@ -1,7 +1,5 @@
 from logging.config import fileConfig
-import os
 from pathlib import Path
-from urllib.parse import quote_plus
 
 from dotenv import load_dotenv
 from sqlalchemy import engine_from_config
@@ -9,6 +7,8 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from app.migrations import database_url
+
 # Load environment variables from .env file
 env_path = Path(__file__).parent.parent.parent / ".env"
 load_dotenv(env_path)
@@ -46,17 +46,7 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    # Build URL from environment variables
-    postgres_user = os.getenv("POSTGRES_USER", "postgres")
-    postgres_password = os.getenv("POSTGRES_PASSWORD", "")
-    postgres_db = os.getenv("POSTGRES_DB", "postgres")
-    postgres_host = os.getenv("POSTGRES_HOST", "localhost")
-    postgres_port = os.getenv("POSTGRES_PORT", "5432")
-
-    # URL encode the password to handle special characters
-    encoded_password = quote_plus(postgres_password)
-
-    url = f"postgresql+psycopg2://{postgres_user}:{encoded_password}@{postgres_host}:{postgres_port}/{postgres_db}"
+    url = database_url()
 
     context.configure(
         url=url,
@@ -76,20 +66,17 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    # Build URL from environment variables
-    postgres_user = os.getenv("POSTGRES_USER", "postgres")
-    postgres_password = os.getenv("POSTGRES_PASSWORD", "")
-    postgres_db = os.getenv("POSTGRES_DB", "postgres")
-    postgres_host = os.getenv("POSTGRES_HOST", "localhost")
-    postgres_port = os.getenv("POSTGRES_PORT", "5432")
-
-    # URL encode the password to handle special characters
-    encoded_password = quote_plus(postgres_password)
-
-    url = f"postgresql+psycopg2://{postgres_user}:{encoded_password}@{postgres_host}:{postgres_port}/{postgres_db}"
+    # app.migrations hands over its own connection, on which it may hold
+    # the migration lock
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
 
     connectable = engine_from_config(
-        {"sqlalchemy.url": url},
+        {"sqlalchemy.url": database_url()},
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
@@ -0,0 +1,64 @@
+"""add scope bit and seed scopes
+
+Revision ID: e3b1c2d4f5a6
+Revises: 34bdd274980c
+Create Date: 2026-10-16 10:12:41.208311
+
+"""
+
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b1c2d4f5a6"
+down_revision: Union[str, Sequence[str], None] = "34bdd274980c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The scopes the service has always advertised; bits are never renumbered
+SCOPES = [
+    ("openid", "Sign in with OpenID Connect"),
+    ("profile", "Read your name and role"),
+    ("email", "Read your email address"),
+    ("read", "Read your projects"),
+    ("create", "Create projects"),
+    ("update", "Update your projects"),
+    ("delete", "Delete your projects"),
+]
+
+
+def upgrade() -> None:
+    op.add_column("scope", sa.Column("bit", sa.Integer(), nullable=True))
+
+    bind = op.get_bind()
+    existing = {row.name for row in bind.execute(sa.text("SELECT name FROM scope"))}
+    descriptions = dict(SCOPES)
+    # Seeded scopes take the first bits; rows added by hand follow them
+    order = [name for name, _ in SCOPES] + sorted(existing - descriptions.keys())
+
+    for bit, name in enumerate(order):
+        if name in existing:
+            bind.execute(
+                sa.text("UPDATE scope SET bit = :bit WHERE name = :name"),
+                {"bit": bit, "name": name},
+            )
+        else:
+            bind.execute(
+                sa.text(
+                    "INSERT INTO scope (id, name, description, bit) "
+                    "VALUES (:id, :name, :description, :bit)"
+                ),
+                {"id": str(uuid.uuid4()), "name": name, "description": descriptions[name], "bit": bit},
+            )
+
+    op.alter_column("scope", "bit", nullable=False)
+    op.create_unique_constraint("uq_scope_bit", "scope", ["bit"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_scope_bit", "scope", type_="unique")
+    op.drop_column("scope", "bit")
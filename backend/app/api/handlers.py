@@ -38,3 +38,20 @@ async def forbidden_error_handler(request: Request, exc: Exception):
     detail = getattr(exc, "detail", "Forbidden")
 
     return JSONResponse(status_code=403, content={"detail": detail})
+
+
+async def service_unavailable_error_handler(request: Request, exc: Exception):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc) or "Service temporarily unavailable"},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def redis_unavailable_error_handler(request: Request, exc: Exception):
+    # The exception text names the Redis host; keep it out of the response
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service temporarily unavailable"},
+        headers={"Retry-After": "1"},
+    )
@@ -4,6 +4,7 @@ import json
 import os
 import urllib.parse
 import secrets
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 from fastapi import (
@@ -16,11 +17,37 @@ from fastapi import (
     Request,
     status,
 )
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response
 import jwt
-
-from app.core.database import SessionDep
-from app.core.redis_instance import RedisSingleton
+from sqlmodel import select
+
+from app.core.client_token_cache import get_reusable_token, remember_token
+from app.core.consent_store import (
+    grant_consent,
+    has_consent,
+    list_consents,
+    revoke_consents,
+)
+from app.core.database import AsyncSessionDep
+from app.core.jwt_keys import JWKS_MAX_AGE, JWT_SIGNING_ALG, key_ring
+from app.core.metrics import tokens_issued
+from app.core.redis_instance import LazyAsyncRedis
+from app.core.revocation import revocation_list
+from app.core.scope_registry import scope_registry
+from app.core.session_store import delete_session
+from app.core.token_families import Rotation, rotate_family, start_family
+from app.core.token_verifier import (
+    ACCESS_TOKEN_TTL,
+    ACCESS_TOKEN_USE,
+    ID_TOKEN_USE,
+    REFRESH_TOKEN_TTL,
+    REFRESH_TOKEN_USE,
+    is_revoked,
+    revoke_family,
+    revoke_token,
+    verify_access_token,
+    verify_refresh_token,
+)
 from app.dependencies.auth import (
     get_current_user_or_none,
     get_user_required,
@@ -28,19 +55,28 @@ from app.dependencies.auth import (
 )
 from app.models.oauth_client import OAuthClient
 from app.models.user import User
+from app.repositories.oauth_client.oauth_client_cache import (
+    get_allowed_scope_mask,
+    get_client,
+)
 from app.schemas.auth_code_grant.auth_code_grant import (
     AuthorizationRequest,
+    IntrospectionRequest,
     TokenRequest,
 )
+from app.schemas.user.user import UserSnapshot
+from app.services.exceptions import ServiceUnavailableError
 
 router = APIRouter(tags=["Authorization Code"])
-redis_client = RedisSingleton().getInstance()
+redis_client = LazyAsyncRedis()
 
-SECRET_JWT = os.getenv("SECRET_JWT")
 JWT_ISSUER = os.getenv("JWT_ISSUER")
 
 AUTH_FRONTEND_URL = os.getenv("AUTH_FRONTEND_URL", "http://localhost:3000")
 
+INTROSPECTION_BATCH_LIMIT = int(os.getenv("INTROSPECTION_BATCH_LIMIT", "100"))
+INTROSPECTION_MAX_AGE = int(os.getenv("INTROSPECTION_MAX_AGE", "300"))
+
 
 ####################
 # Utility Functions
@@ -87,34 +123,61 @@ def _verify_pkce(code_verifier: str, code_challenge: str, method: str = "S256")
     return False
 
 
-def _generate_tokens(user_id: str, client_id: str, scopes: str, session: SessionDep) -> dict:
-    """Generate access_token, refresh_token, and optional id_token."""
+async def _generate_tokens(
+    user_id: str,
+    client_id: str,
+    scopes: str,
+    session: AsyncSessionDep,
+    family_id: str | None = None,
+    refresh_token_id: str | None = None,
+) -> dict:
+    """Generate access_token, refresh_token, and optional id_token.
+
+    Without a `family_id` the refresh token starts a new family. A refresh
+    grant passes the family and successor jti it has already rotated to.
+    """
     now = datetime.now(timezone.utc)
     scope_list = (scopes or "").split()
     is_oidc = "openid" in scope_list
+    user_epoch, client_epoch = await revocation_list.current_epochs(str(user_id), client_id)
+
+    if family_id is None:
+        family_id = secrets.token_urlsafe(16)
+        refresh_token_id = secrets.token_urlsafe(16)
+        await start_family(family_id, refresh_token_id, REFRESH_TOKEN_TTL)
 
     access_token_data = {
         "sub": str(user_id),
         "client_id": client_id,
         "scope": scopes,
-        "exp": now + timedelta(hours=1),
+        "exp": now + timedelta(seconds=ACCESS_TOKEN_TTL),
         "iat": now,
         "iss": JWT_ISSUER,
         "token_type": "bearer",
+        "jti": secrets.token_urlsafe(16),
+        "fid": family_id,
+        "uep": user_epoch,
+        "cep": client_epoch,
+        "token_use": ACCESS_TOKEN_USE,
     }
 
     refresh_token_data = {
         "sub": str(user_id),
         "client_id": client_id,
         "scope": scopes,
-        "exp": now + timedelta(days=30),
+        "exp": now + timedelta(seconds=REFRESH_TOKEN_TTL),
         "iat": now,
         "iss": JWT_ISSUER,
         "token_type": "bearer",
+        "jti": refresh_token_id,
+        "fid": family_id,
+        "uep": user_epoch,
+        "cep": client_epoch,
+        "token_use": REFRESH_TOKEN_USE,
     }
 
-    access_token = jwt.encode(access_token_data, str(SECRET_JWT), algorithm="HS256")
-    refresh_token = jwt.encode(refresh_token_data, str(SECRET_JWT), algorithm="HS256")
+    access_token = key_ring.sign(access_token_data)
+    refresh_token = key_ring.sign(refresh_token_data)
 
     tokens = {
         "access_token": access_token,
@@ -123,7 +186,7 @@ def _generate_tokens(user_id: str, client_id: str, scopes: str, session: Session
     }
 
     if is_oidc:
-        user = session.get(User, user_id)
+        user = await session.get(User, user_id)
         if user:
             id_token_data = {
                 "iss": JWT_ISSUER,
@@ -133,10 +196,9 @@ def _generate_tokens(user_id: str, client_id: str, scopes: str, session: Session
                 "iat": now,
                 "email": user.email,
                 "role": user.role,
+                "token_use": ID_TOKEN_USE,
             }
-            tokens["id_token"] = jwt.encode(
-                id_token_data, str(SECRET_JWT), algorithm="HS256"
-            )
+            tokens["id_token"] = key_ring.sign(id_token_data)
 
     return tokens
 
@@ -146,7 +208,7 @@ def _build_token_response(tokens: dict, response_headers: dict) -> JSONResponse:
     content = {
         "access_token": tokens["access_token"],
         "token_type": "Bearer",
-        "expires_in": 3600,
+        "expires_in": ACCESS_TOKEN_TTL,
         "refresh_token": tokens["refresh_token"],
         "scope": tokens["scopes"],
     }
@@ -165,7 +227,7 @@ def _build_token_response(tokens: dict, response_headers: dict) -> JSONResponse:
         value=tokens["access_token"],
         httponly=True,
         samesite="lax",
-        max_age=3600,
+        max_age=ACCESS_TOKEN_TTL,
     )
 
     response.set_cookie(
@@ -173,7 +235,7 @@ def _build_token_response(tokens: dict, response_headers: dict) -> JSONResponse:
         value=tokens["refresh_token"],
         httponly=True,
         samesite="lax",
-        max_age=60 * 60 * 24 * 30,  # 30 days
+        max_age=REFRESH_TOKEN_TTL,
     )
 
     if "id_token" in tokens:
@@ -194,11 +256,11 @@ def _build_token_response(tokens: dict, response_headers: dict) -> JSONResponse:
 
 
 @router.get(path="/authorize")
-def authorize_client(
+async def authorize_client(
     request: Request,
     req_params: Annotated[AuthorizationRequest, Query()],
-    session: SessionDep,
-    current_user: Annotated[User | None, Depends(get_current_user_or_none)],
+    session: AsyncSessionDep,
+    current_user: Annotated[UserSnapshot | None, Depends(get_current_user_or_none)],
 ):
     """
     RFC 6749 Section 4.1.1 - Authorization Request.
@@ -219,7 +281,7 @@ def authorize_client(
                 url=f"{AUTH_FRONTEND_URL}/login?return_to=/authorize&oauth_params={original_params}"
             )
 
-        client_db = session.get(OAuthClient, req_params.client_id)
+        client_db = await get_client(session, req_params.client_id)
         if client_db is None:
             raise HTTPException(status_code=400, detail="Invalid client.")
 
@@ -250,35 +312,35 @@ def authorize_client(
 
         redirect_uri_formatted = format_url(base_url=req_params.redirect_uri)
 
-        consent_key = f"consent_granted:{current_user.id}:{client_db.client_id}"
-        existing_consent = redis_client.get(consent_key)
-
-        if existing_consent:
-            try:
-                granted_scopes = set(json.loads(str(existing_consent)))
-                requested_scopes = set((scopes or "").split())
-
-                if requested_scopes.issubset(granted_scopes):
-                    code = secrets.token_urlsafe(32)
-                    auth_data = {
-                        "user_id": current_user.id,
-                        "client_id": client_db.client_id,
-                        "redirect_uri": redirect_uri_formatted,
-                        "scopes": scopes or "",
-                        "code_challenge": req_params.code_challenge or "",
-                        "code_challenge_method": req_params.code_challenge_method or "S256",
-                    }
-                    redis_client.set(
-                        name=f"{client_db.client_id}:auth_code:{code}",
-                        value=json.dumps(auth_data),
-                        ex=600,
-                    )
-                    query = f"code={code}"
-                    if req_params.state:
-                        query += f"&state={req_params.state}"
-                    return RedirectResponse(url=f"{req_params.redirect_uri}?{query}")
-            except (json.JSONDecodeError, Exception):
-                pass
+        requested_scopes = sorted(set((scopes or "").split()))
+
+        # Unknown scopes have no bit and fail this too. Checked before any
+        # consent or code is written to Redis
+        allowed_mask = await get_allowed_scope_mask(session, client_db.client_id)
+        if not all(scope_registry.bit(s) & allowed_mask for s in requested_scopes):
+            return RedirectResponse(
+                f"{build_error_url(base_url=BASE_URL, error="invalid_scope")}"
+            )
+
+        if await has_consent(current_user.id, client_db.client_id, requested_scopes):
+            code = secrets.token_urlsafe(32)
+            auth_data = {
+                "user_id": current_user.id,
+                "client_id": client_db.client_id,
+                "redirect_uri": redirect_uri_formatted,
+                "scopes": scopes or "",
+                "code_challenge": req_params.code_challenge or "",
+                "code_challenge_method": req_params.code_challenge_method or "S256",
+            }
+            await redis_client.set(
+                name=f"{client_db.client_id}:auth_code:{code}",
+                value=json.dumps(auth_data),
+                ex=600,
+            )
+            query = f"code={code}"
+            if req_params.state:
+                query += f"&state={req_params.state}"
+            return RedirectResponse(url=f"{req_params.redirect_uri}?{query}")
 
         consent_id = secrets.token_urlsafe(32)
         consent_data = {
@@ -293,7 +355,7 @@ def authorize_client(
             "code_challenge_method": req_params.code_challenge_method or "S256",
         }
 
-        redis_client.set(
+        await redis_client.set(
             name=f"consent:{consent_id}",
             value=json.dumps(consent_data),
             ex=600,  # 10 minutes to complete the consent flow
@@ -317,9 +379,9 @@ def authorize_client(
 
 
 @router.get(path="/authorize/consent-data")
-def get_consent_data(
+async def get_consent_data(
     consent_id: str = Query(...),
-    current_user: User | None = Depends(get_current_user_or_none),
+    current_user: UserSnapshot | None = Depends(get_current_user_or_none),
 ):
     """
     Returns the consent request data so the auth-frontend consent screen
@@ -328,7 +390,7 @@ def get_consent_data(
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    consent_data_raw = redis_client.get(f"consent:{consent_id}")
+    consent_data_raw = await redis_client.get(f"consent:{consent_id}")
     if not consent_data_raw:
         raise HTTPException(
             status_code=404, detail="Consent request not found or expired"
@@ -349,14 +411,14 @@ def get_consent_data(
 
 
 @router.post(path="/authorize/consent")
-def handle_consent(
-    session: SessionDep,
-    current_user: Annotated[User, Depends(get_user_required)],
+async def handle_consent(
+    session: AsyncSessionDep,
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
     consent_id: str = Body(...),
     approved: bool = Body(...),
     approved_scopes: list[str] = Body(default=[]),
 ):
-    consent_data_raw = redis_client.get(f"consent:{consent_id}")
+    consent_data_raw = await redis_client.get(f"consent:{consent_id}")
     if not consent_data_raw:
         raise HTTPException(
             status_code=400, detail="Consent request not found or expired"
@@ -369,7 +431,7 @@ def handle_consent(
             status_code=403, detail="Consent does not belong to this user"
         )
 
-    redis_client.delete(f"consent:{consent_id}")
+    await redis_client.delete(f"consent:{consent_id}")
 
     redirect_uri = consent_data.get("redirect_uri")
     state = consent_data.get("state")
@@ -386,16 +448,26 @@ def handle_consent(
 
     # User approved — generate authorization code
     # Use the approved scopes (which may be a subset of what was requested)
-    final_scopes = (
-        " ".join(approved_scopes) if approved_scopes else consent_data.get("scopes", "")
-    )
+    requested_scopes = consent_data.get("scopes", "").split()
+    final_scope_list = approved_scopes or requested_scopes
+
+    # The user may narrow what /authorize validated, never widen it; the
+    # client's allowed scopes are checked again as they may have changed
+    allowed_mask = await get_allowed_scope_mask(session, consent_data.get("client_id"))
+    if not set(final_scope_list) <= set(requested_scopes) or not all(
+        scope_registry.bit(s) & allowed_mask for s in final_scope_list
+    ):
+        error_url = f"{redirect_uri}?error=invalid_scope"
+        if state:
+            error_url += f"&state={state}"
+        return JSONResponse(
+            status_code=200,
+            content={"redirect_url": error_url},
+        )
 
-    consent_key = f"consent_granted:{current_user.id}:{consent_data.get('client_id')}"
-    redis_client.set(
-        name=consent_key,
-        value=json.dumps(final_scopes.split()),
-        ex=60 * 60 * 24 * 30,  # 30 days
-    )
+    final_scopes = " ".join(final_scope_list)
+
+    await grant_consent(current_user.id, consent_data.get("client_id"), final_scope_list)
 
     code = secrets.token_urlsafe(32)
 
@@ -408,7 +480,7 @@ def handle_consent(
         "code_challenge_method": consent_data.get("code_challenge_method", "S256"),
     }
 
-    redis_client.set(
+    await redis_client.set(
         name=f"{consent_data.get('client_id')}:auth_code:{code}",
         value=json.dumps(auth_data),
         ex=600,  # RFC 6749 - max 10 minutes
@@ -424,37 +496,91 @@ def handle_consent(
     )
 
 
+@router.get(path="/authorize/grants")
+async def list_grants(
+    session: AsyncSessionDep,
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
+):
+    """
+    Lists the applications the current user has authorized and the scopes
+    granted to each. Costs one Redis round trip and one database query
+    regardless of how many applications there are.
+    """
+    consents = await list_consents(current_user.id)
+    if not consents:
+        return {"grants": []}
+
+    result = await session.exec(
+        select(OAuthClient).where(OAuthClient.client_id.in_(list(consents)))
+    )
+    names = {client.client_id: client.client_name for client in result.all()}
+
+    return {
+        "grants": [
+            {
+                "client_id": client_id,
+                "client_name": names.get(client_id) or client_id,
+                "scopes": consent["scopes"],
+                "granted_at": consent["granted_at"],
+            }
+            for client_id, consent in sorted(
+                consents.items(), key=lambda item: item[1]["granted_at"], reverse=True
+            )
+        ]
+    }
+
+
+@router.delete(path="/authorize/grants")
+async def revoke_grants(
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
+    client_id: Annotated[list[str] | None, Query()] = None,
+):
+    """
+    Revokes the current user's consent for the given `client_id`s, or for
+    every application when none are given, in a single Redis round trip.
+    The consent screen is shown again on the next authorization. Tokens
+    already issued are left alone; see /users/me/revoke-tokens.
+    """
+    await revoke_consents(current_user.id, client_id)
+    return {"message": "Grants revoked successfully"}
+
+
 @router.post(path="/token")
-def token_endpoint(
+async def token_endpoint(
     request: Request,
     req_params: Annotated[TokenRequest, Body()],
-    session: SessionDep,
+    session: AsyncSessionDep,
     authorization: Annotated[str | None, Header()] = None,
 ):
     """
     RFC 6749 Section 4.1.3 & 6 - Unified Token Endpoint.
 
-    Handles both grant types:
+    Handles these grant types:
     - grant_type=authorization_code (exchange code for tokens)
     - grant_type=refresh_token (refresh an expired access token)
+    - grant_type=client_credentials (machine token for the client itself)
     """
     response_headers = {"Cache-Control": "no-store", "Pragma": "no-cache"}
 
     try:
         if req_params.grant_type == "authorization_code":
-            return _handle_authorization_code_grant(
+            return await _handle_authorization_code_grant(
                 request, req_params, session, authorization, response_headers
             )
         elif req_params.grant_type == "refresh_token":
-            return _handle_refresh_token_grant(
+            return await _handle_refresh_token_grant(
                 request, req_params, session, authorization, response_headers
             )
+        elif req_params.grant_type == "client_credentials":
+            return await _handle_client_credentials_grant(
+                req_params, session, authorization, response_headers
+            )
         else:
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
                     "error": "unsupported_grant_type",
-                    "error_description": f"Supported grant types: 'authorization_code', 'refresh_token'. Got '{req_params.grant_type}'",
+                    "error_description": f"Supported grant types: 'authorization_code', 'refresh_token', 'client_credentials'. Got '{req_params.grant_type}'",
                 },
                 headers=response_headers,
             )
@@ -466,6 +592,13 @@ def token_endpoint(
             headers=response_headers,
         )
 
+    except ServiceUnavailableError as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"error": "temporarily_unavailable", "error_description": str(e)},
+            headers={**response_headers, "Retry-After": "1"},
+        )
+
     except Exception as e:
         print(f"Unexpected error in token endpoint: {e}")
         import traceback
@@ -481,10 +614,10 @@ def token_endpoint(
         )
 
 
-def _handle_authorization_code_grant(
+async def _handle_authorization_code_grant(
     request: Request,
     req_params: TokenRequest,
-    session: SessionDep,
+    session: AsyncSessionDep,
     authorization: str | None,
     response_headers: dict,
 ) -> JSONResponse:
@@ -510,14 +643,16 @@ def _handle_authorization_code_grant(
             headers=response_headers,
         )
 
-    client = _authenticate_client(
+    client = await _authenticate_client(
         req_params.client_id, authorization, session, response_headers
     )
     if isinstance(client, JSONResponse):
         return client
 
+    # GETDEL consumes the code in the same round trip that reads it, so two
+    # concurrent redemptions of one code cannot both succeed.
     redis_key = f"{client.client_id}:auth_code:{req_params.code}"
-    auth_code_data = redis_client.get(redis_key)
+    auth_code_data = await redis_client.getdel(redis_key)
 
     if not auth_code_data:
         return JSONResponse(
@@ -542,7 +677,6 @@ def _handle_authorization_code_grant(
         )
 
     if auth_data.get("client_id") != client.client_id:
-        redis_client.delete(redis_key)
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
@@ -554,7 +688,6 @@ def _handle_authorization_code_grant(
 
     redirect_uri_formatted = format_url(base_url=req_params.redirect_uri)
     if auth_data.get("redirect_uri") != redirect_uri_formatted:
-        redis_client.delete(redis_key)
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
@@ -564,8 +697,6 @@ def _handle_authorization_code_grant(
             headers=response_headers,
         )
 
-    redis_client.delete(redis_key)
-
     # PKCE verification (RFC 7636)
     code_challenge = auth_data.get("code_challenge", "")
     if code_challenge:
@@ -592,14 +723,15 @@ def _handle_authorization_code_grant(
     user_id = auth_data.get("user_id")
     scopes = auth_data.get("scopes", "")
 
-    tokens = _generate_tokens(user_id, client.client_id, scopes, session)
+    tokens = await _generate_tokens(user_id, client.client_id, scopes, session)
+    tokens_issued.labels("authorization_code").inc()
     return _build_token_response(tokens, response_headers)
 
 
-def _handle_refresh_token_grant(
+async def _handle_refresh_token_grant(
     request: Request,
     req_params: TokenRequest,
-    session: SessionDep,
+    session: AsyncSessionDep,
     authorization: str | None,
     response_headers: dict,
 ) -> JSONResponse:
@@ -618,12 +750,7 @@ def _handle_refresh_token_grant(
         )
 
     try:
-        refresh_token_data = jwt.decode(
-            refresh_token,
-            str(SECRET_JWT),
-            algorithms=["HS256"],
-            issuer=JWT_ISSUER,
-        )
+        refresh_token_data = key_ring.decode(refresh_token, issuer=JWT_ISSUER)
     except jwt.ExpiredSignatureError:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -643,11 +770,35 @@ def _handle_refresh_token_grant(
             headers=response_headers,
         )
 
+    # An access or ID token must not reach rotate_family: its jti is not the
+    # family's current one, which would read as reuse and end the family
+    if refresh_token_data.get("token_use") != REFRESH_TOKEN_USE:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "error": "invalid_grant",
+                "error_description": "Token is not a refresh token",
+            },
+            headers=response_headers,
+        )
+
+    if await is_revoked(refresh_token_data):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "error": "invalid_grant",
+                "error_description": "Refresh token has been revoked",
+            },
+            headers=response_headers,
+        )
+
     user_id = refresh_token_data.get("sub")
     client_id = refresh_token_data.get("client_id")
     original_scopes = refresh_token_data.get("scope", "")
+    family_id = refresh_token_data.get("fid")
+    token_id = refresh_token_data.get("jti")
 
-    if not user_id or not client_id:
+    if not user_id or not client_id or not family_id or not token_id:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
@@ -657,7 +808,7 @@ def _handle_refresh_token_grant(
             headers=response_headers,
         )
 
-    client = session.get(OAuthClient, client_id)
+    client = await get_client(session, client_id)
 
     if not client:
         return JSONResponse(
@@ -687,7 +838,7 @@ def _handle_refresh_token_grant(
 
     auth_credentials = extract_client_credentials(authorization)
     if auth_credentials["client_secret"]:
-        if not client.verify_secret(auth_credentials["client_secret"]):
+        if not await client.verify_secret(auth_credentials["client_secret"]):
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={
@@ -717,14 +868,136 @@ def _handle_refresh_token_grant(
             )
         scopes = req_params.scope
 
-    tokens = _generate_tokens(user_id, client.client_id, scopes, session)
+    # Each refresh token is single use: consume it and register its successor
+    next_token_id = secrets.token_urlsafe(16)
+    rotation = await rotate_family(family_id, token_id, next_token_id, REFRESH_TOKEN_TTL)
+
+    if rotation is Rotation.REUSED:
+        # Either the client or an attacker holds a stolen copy; stop both
+        await revoke_family(family_id)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "error": "invalid_grant",
+                "error_description": "Refresh token has already been used",
+            },
+            headers=response_headers,
+        )
+
+    if rotation is Rotation.UNKNOWN_FAMILY:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "error": "invalid_grant",
+                "error_description": "Refresh token has been revoked",
+            },
+            headers=response_headers,
+        )
+
+    tokens = await _generate_tokens(
+        user_id, client.client_id, scopes, session, family_id, next_token_id
+    )
+    tokens_issued.labels("refresh_token").inc()
     return _build_token_response(tokens, response_headers)
 
 
-def _authenticate_client(
+async def _handle_client_credentials_grant(
+    req_params: TokenRequest,
+    session: AsyncSessionDep,
+    authorization: str | None,
+    response_headers: dict,
+) -> JSONResponse:
+    """Handle grant_type=client_credentials (RFC 6749 Section 4.4).
+
+    The token is issued to the client itself (`sub` is the client_id) and
+    comes without a refresh token. Unless CLIENT_TOKEN_REUSE is off, a
+    still-valid token issued earlier for the same scope set is returned
+    instead of signing a new one.
+    """
+
+    # Only confidential clients may use this grant, so a secret is required
+    if not extract_client_credentials(authorization)["client_secret"]:
+        return JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={
+                "error": "invalid_client",
+                "error_description": "Client authentication required",
+            },
+            headers={
+                **response_headers,
+                "WWW-Authenticate": 'Basic realm="OAuth2"',
+            },
+        )
+
+    client = await _authenticate_client(None, authorization, session, response_headers)
+    if isinstance(client, JSONResponse):
+        return client
+
+    if "client_credentials" not in client.grant_types:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "error": "unauthorized_client",
+                "error_description": "Client is not registered for the client_credentials grant",
+            },
+            headers=response_headers,
+        )
+
+    allowed_mask = await get_allowed_scope_mask(session, client.client_id)
+    if req_params.scope:
+        scopes = sorted(set(req_params.scope.split()))
+        if not all(scope_registry.bit(s) & allowed_mask for s in scopes):
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "error": "invalid_scope",
+                    "error_description": "Requested scope is not allowed for this client",
+                },
+                headers=response_headers,
+            )
+    else:
+        # Default to everything the client may request; none if unrestricted
+        scopes = scope_registry.names_in(allowed_mask) if allowed_mask != -1 else []
+
+    cached = get_reusable_token(client.client_id, scopes)
+    if cached is not None and not await is_revoked(cached[1]):
+        access_token, claims = cached
+    else:
+        now = datetime.now(timezone.utc)
+        client_epoch = await revocation_list.current_client_epoch(client.client_id)
+        claims = {
+            "sub": client.client_id,
+            "client_id": client.client_id,
+            "scope": " ".join(scopes),
+            "exp": int((now + timedelta(seconds=ACCESS_TOKEN_TTL)).timestamp()),
+            "iat": int(now.timestamp()),
+            "iss": JWT_ISSUER,
+            "token_type": "bearer",
+            "jti": secrets.token_urlsafe(16),
+            "cep": client_epoch,
+            "token_use": ACCESS_TOKEN_USE,
+        }
+        access_token = key_ring.sign(claims)
+        remember_token(client.client_id, scopes, access_token, claims)
+        # Only counted when signed, not when a cached token is handed out again
+        tokens_issued.labels("client_credentials").inc()
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "access_token": access_token,
+            "token_type": "Bearer",
+            "expires_in": max(int(claims["exp"] - time.time()), 0),
+            "scope": claims["scope"],
+        },
+        headers=response_headers,
+    )
+
+
+async def _authenticate_client(
     client_id_param: str | None,
     authorization: str | None,
-    session: SessionDep,
+    session: AsyncSessionDep,
     response_headers: dict,
 ) -> OAuthClient | JSONResponse:
     """Authenticate the client via Basic Auth or client_id parameter."""
@@ -746,7 +1019,7 @@ def _authenticate_client(
             },
         )
 
-    client = session.get(OAuthClient, client_id)
+    client = await get_client(session, client_id)
 
     if not client:
         return JSONResponse(
@@ -774,7 +1047,7 @@ def _authenticate_client(
             },
         )
 
-    if client_secret and not client.verify_secret(client_secret):
+    if client_secret and not await client.verify_secret(client_secret):
         return JSONResponse(
             status_code=status.HTTP_401_UNAUTHORIZED,
             content={
@@ -796,7 +1069,7 @@ def _authenticate_client(
 
 
 @router.post(path="/token/revoke")
-def revoke_tokens(request: Request):
+async def revoke_tokens(request: Request):
     """
     Full logout — revokes ALL tokens:
     - access_token and refresh_token (OAuth tokens)
@@ -808,7 +1081,12 @@ def revoke_tokens(request: Request):
     # Invalidate the Auth Server session in Redis
     session_id = request.cookies.get("token")
     if session_id:
-        redis_client.delete(f"session:{session_id}")
+        await delete_session(session_id)
+
+    for cookie in ("access_token", "refresh_token"):
+        token = request.cookies.get(cookie)
+        if token:
+            await revoke_token(token)
 
     response = JSONResponse(
         status_code=200,
@@ -824,7 +1102,7 @@ def revoke_tokens(request: Request):
 
 
 @router.post(path="/token/revoke-consent")
-def revoke_consent(
+async def revoke_consent(
     current_user: Annotated[User, Depends(get_user_from_access_token)],
     request: Request,
 ):
@@ -836,17 +1114,21 @@ def revoke_consent(
     will appear again because the stored consent was cleared.
     """
     access_token = request.cookies.get("access_token")
+    refresh_token = request.cookies.get("refresh_token")
+    if refresh_token:
+        await revoke_token(refresh_token)
+
     client_id = None
     if access_token:
+        await revoke_token(access_token)
         try:
-            payload = jwt.decode(access_token, str(SECRET_JWT), algorithms=["HS256"])
+            payload = key_ring.decode(access_token)
             client_id = payload.get("client_id")
         except Exception:
             pass
 
     if client_id:
-        consent_key = f"consent_granted:{current_user.id}:{client_id}"
-        redis_client.delete(consent_key)
+        await revoke_consents(current_user.id, [client_id])
 
     response = JSONResponse(
         status_code=200,
@@ -860,13 +1142,113 @@ def revoke_consent(
     return response
 
 
+#####################################
+# Token Introspection
+#####################################
+
+
+async def _introspect(token: str) -> dict:
+    claims = await verify_access_token(token)
+    token_type = "Bearer"
+    if claims is None:
+        claims = await verify_refresh_token(token)
+        token_type = "refresh_token"
+    if claims is None:
+        return {"active": False}
+
+    return {
+        "active": True,
+        "scope": claims.get("scope", ""),
+        "client_id": claims.get("client_id"),
+        "sub": claims.get("sub"),
+        "exp": claims.get("exp"),
+        "iat": claims.get("iat"),
+        "iss": claims.get("iss"),
+        "token_type": token_type,
+    }
+
+
+@router.post(path="/token/introspect")
+async def introspect_token(
+    req_params: Annotated[IntrospectionRequest, Body()],
+    session: AsyncSessionDep,
+    authorization: Annotated[str | None, Header()] = None,
+):
+    """
+    RFC 7662 - Token Introspection.
+
+    The calling client authenticates with HTTP Basic. A single `token` gets a
+    standard introspection response; a `tokens` batch gets one response per
+    token under `results`, in request order. Tokens are checked against the
+    signing keys, the verified-token cache and the revocation list only,
+    never the database.
+    Responses may be cached until the earliest active token expires, capped
+    at INTROSPECTION_MAX_AGE.
+    """
+    response_headers = {"Cache-Control": "no-store", "Pragma": "no-cache"}
+
+    if not extract_client_credentials(authorization)["client_secret"]:
+        return JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={
+                "error": "invalid_client",
+                "error_description": "Client authentication required",
+            },
+            headers={**response_headers, "WWW-Authenticate": 'Basic realm="OAuth2"'},
+        )
+
+    try:
+        client = await _authenticate_client(None, authorization, session, response_headers)
+    except ServiceUnavailableError as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"error": "temporarily_unavailable", "error_description": str(e)},
+            headers={**response_headers, "Retry-After": "1"},
+        )
+    if isinstance(client, JSONResponse):
+        return client
+
+    tokens = req_params.tokens if req_params.tokens is not None else [req_params.token]
+    if not tokens or any(not token for token in tokens):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "error": "invalid_request",
+                "error_description": "Missing required parameter: token",
+            },
+            headers=response_headers,
+        )
+
+    if len(tokens) > INTROSPECTION_BATCH_LIMIT:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "error": "invalid_request",
+                "error_description": f"At most {INTROSPECTION_BATCH_LIMIT} tokens per request",
+            },
+            headers=response_headers,
+        )
+
+    results = [await _introspect(token) for token in tokens]
+
+    now = int(datetime.now(timezone.utc).timestamp())
+    max_age = min(
+        [INTROSPECTION_MAX_AGE]
+        + [result["exp"] - now for result in results if result["active"]]
+    )
+    cache_headers = {"Cache-Control": f"private, max-age={max(max_age, 0)}"}
+
+    content = {"results": results} if req_params.tokens is not None else results[0]
+    return JSONResponse(status_code=status.HTTP_200_OK, content=content, headers=cache_headers)
+
+
 #####################################
 # OIDC Discovery
 #####################################
 
 
 @router.get("/.well-known/openid-configuration", include_in_schema=False)
-def openid_configuration(request: Request):
+async def openid_configuration(request: Request):
     """
     OIDC Discovery endpoint.
     Provides metadata about the OpenID Connect provider.
@@ -876,12 +1258,29 @@ def openid_configuration(request: Request):
         "issuer": JWT_ISSUER,
         "authorization_endpoint": f"{base_url}/authorize",
         "token_endpoint": f"{base_url}/token",
+        "introspection_endpoint": f"{base_url}/token/introspect",
         "userinfo_endpoint": f"{base_url}/auth/userinfo",
-        "jwks_uri": f"{base_url}/.well-known/jwks.json",  # Placeholder if you add JWKS later
+        "jwks_uri": f"{base_url}/.well-known/jwks.json",
         "response_types_supported": ["code"],
+        "grant_types_supported": ["authorization_code", "refresh_token", "client_credentials"],
         "subject_types_supported": ["public"],
-        "id_token_signing_alg_values_supported": ["HS256"],
-        "scopes_supported": ["openid", "profile", "email", "read", "create", "update", "delete"],
+        "id_token_signing_alg_values_supported": [JWT_SIGNING_ALG],
+        "scopes_supported": scope_registry.names,
         "token_endpoint_auth_methods_supported": ["client_secret_basic", "client_secret_post"],
         "claims_supported": ["sub", "iss", "auth_time", "name", "email", "role"],
     }
+
+
+@router.get("/.well-known/jwks.json", include_in_schema=False)
+async def jwks(request: Request):
+    """
+    JSON Web Key Set with the public half of every published signing key,
+    including retired keys whose tokens have not expired yet.
+    """
+    body, etag = key_ring.jwks
+    headers = {"Cache-Control": f"public, max-age={JWKS_MAX_AGE}", "ETag": etag}
+
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,47 +1,30 @@
 import os
-import secrets
 import traceback
 from typing import Annotated
 from fastapi.responses import JSONResponse
 from sqlmodel import select
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 
-from app.core.database import SessionDep
-from app.core.bcrypt_encrypter import hash_text, verify_text
-from app.core.redis_instance import RedisSingleton
+from app.core.database import AsyncSessionDep
+from app.core.bcrypt_encrypter import hash_text_async, verify_text_async
+from app.core.session_store import SESSION_TTL, create_session, delete_session
 from app.dependencies.auth import (
     get_user_required,
     get_user_from_access_token,
 )
 from app.models.user import UserRole, User
-from app.schemas.user.user import UserLogin, UserRegistration
+from app.schemas.user.user import UserLogin, UserRegistration, UserSnapshot
+from app.services.exceptions import ServiceUnavailableError
 import uuid
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-redis_client = RedisSingleton().getInstance()
-
-SESSION_TTL = 60 * 60 * 24  # 24 hours
-
-
-def _create_session(user: User) -> str:
-    """Create a session in Redis and return the session ID."""
-    session_id = secrets.token_urlsafe(32)
-    session_data = f"{user.id}"
-    redis_client.set(
-        name=f"session:{session_id}",
-        value=session_data,
-        ex=SESSION_TTL,
-    )
-    return session_id
-
 
 @router.post("/signup")
-def signup_jwt(user: UserRegistration, session: SessionDep):
+async def signup_jwt(user: UserRegistration, session: AsyncSessionDep):
     try:
-        user_db: User | None = session.exec(
-            select(User).where(User.email == user.email)
-        ).first()
+        result = await session.exec(select(User).where(User.email == user.email))
+        user_db: User | None = result.first()
         if user_db:
             raise HTTPException(
                 status_code=409,
@@ -52,15 +35,15 @@ def signup_jwt(user: UserRegistration, session: SessionDep):
         new_user: User = User(
             id=user_id,
             email=user.email,
-            password=hash_text(user.password),
+            password=await hash_text_async(user.password),
             role=UserRole.USER,
         )
 
         session.add(new_user)
-        session.commit()
-        session.refresh(new_user)
+        await session.commit()
+        await session.refresh(new_user)
 
-        session_id = _create_session(new_user)
+        session_id = await create_session(new_user)
 
         response = JSONResponse(
             status_code=200,
@@ -77,6 +60,8 @@ def signup_jwt(user: UserRegistration, session: SessionDep):
         return response
     except HTTPException as e:
         return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+    except ServiceUnavailableError:
+        raise
     except TypeError as e:
         print("[signup - session] TypeError:", str(e))
         traceback.print_exc()
@@ -92,11 +77,10 @@ def signup_jwt(user: UserRegistration, session: SessionDep):
 
 
 @router.post("/login")
-def login(user: UserLogin, session: SessionDep):
+async def login(user: UserLogin, session: AsyncSessionDep):
     try:
-        user_db: User | None = session.exec(
-            select(User).where(User.email == user.email)
-        ).first()
+        result = await session.exec(select(User).where(User.email == user.email))
+        user_db: User | None = result.first()
 
         if user_db is None:
             raise HTTPException(
@@ -104,7 +88,7 @@ def login(user: UserLogin, session: SessionDep):
                 detail="Invalid user. Try again.",
             )
 
-        is_pwd_correct = verify_text(
+        is_pwd_correct = await verify_text_async(
             plain_text=user.password, hashed_text=user_db.password
         )
 
@@ -114,7 +98,7 @@ def login(user: UserLogin, session: SessionDep):
                 detail="Invalid user. Try again.",
             )
 
-        session_id = _create_session(user_db)
+        session_id = await create_session(user_db)
 
         response = JSONResponse(
             status_code=200,
@@ -131,6 +115,8 @@ def login(user: UserLogin, session: SessionDep):
         return response
     except HTTPException as e:
         return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         print("[auth - login] Error:", e)
         traceback.print_exc()
@@ -140,8 +126,8 @@ def login(user: UserLogin, session: SessionDep):
 
 
 @router.get("/me")
-def me(
-    current_user: Annotated[User, Depends(get_user_required)],
+async def me(
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
 ):
     """
     Auth Server session endpoint.
@@ -164,7 +150,7 @@ def me(
 
 
 @router.get("/userinfo")
-def userinfo(
+async def userinfo(
     current_user: Annotated[User, Depends(get_user_from_access_token)],
 ):
     """
@@ -187,16 +173,15 @@ def userinfo(
 
 
 @router.post("/logout")
-def logout(request=None):
+async def logout(request: Request):
     response = JSONResponse(
         status_code=200, content={"message": "Logged out successfully"}
     )
 
     # Invalidate the session in Redis
-    if request:
-        session_id = request.cookies.get("token")
-        if session_id:
-            redis_client.delete(f"session:{session_id}")
+    session_id = request.cookies.get("token")
+    if session_id:
+        await delete_session(session_id)
 
     response.delete_cookie(key="token", samesite="lax")
 
@@ -204,7 +189,7 @@ def logout(request=None):
 
 
 @router.post("/forgot-password")
-def forgot_password(data: dict):
+async def forgot_password(data: dict):
     email = data.get("email")
     if not email:
         raise HTTPException(status_code=400, detail="Email is required")
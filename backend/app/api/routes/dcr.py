@@ -1,21 +1,32 @@
-from typing import Annotated
-from fastapi import Depends
+import json
+from typing import Annotated, AsyncIterator
+from fastapi import Depends, Request
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRouter
 
-from app.dependencies.auth import get_user_required
+from app.dependencies.auth import get_admin_required, get_user_required
 from app.dependencies.oauth_client import get_oauth_client_service
 from app.domain.oauth_client.oauth_client_domain import OAuthClientDomain
-from app.models.user import User
-from app.schemas.dcr.dcr import ClientMetadataRegister, ClientMetadataResponse
+from app.schemas.user.user import UserSnapshot
+from app.schemas.dcr.dcr import (
+    ClientMetadataRegister,
+    ClientMetadataResponse,
+    ClientScopeUpdate,
+)
 from app.services.oauth_client.ioauth_client_service import IOAuthClientService
 
 
 router = APIRouter(prefix="/dcr", tags=["Dynamic Client Registration"])
 
 
+async def _iter_lines(body: bytes) -> AsyncIterator[str]:
+    for line in body.split(b"\n"):
+        yield line.decode("utf-8", errors="replace")
+
+
 @router.post("/register")
-def register_client(
-    current_user: Annotated[User, Depends(get_user_required)],
+async def register_client(
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
     oauth_client_service: Annotated[
         IOAuthClientService, Depends(get_oauth_client_service)
     ],
@@ -26,7 +37,7 @@ def register_client(
         payload=payload, current_user=current_user
     )
 
-    register_response = oauth_client_service.register_client(client=domain_client)
+    register_response = await oauth_client_service.register_client(client=domain_client)
 
     response = ClientMetadataResponse(
         client_id=register_response.client_id,
@@ -34,20 +45,21 @@ def register_client(
         issued_at=register_response.issued_at,
         client_name=register_response.client_name,
         redirect_uris=register_response.redirect_uris,
+        scope=" ".join(register_response.scopes) if register_response.scopes else None,
     )
 
     return response
 
 
 @router.post("/{client_id}/rotate-secret")
-def rotate_client_secret(
+async def rotate_client_secret(
     client_id: str,
-    current_user: Annotated[User, Depends(get_user_required)],
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
     oauth_client_service: Annotated[
         IOAuthClientService, Depends(get_oauth_client_service)
     ],
 ):
-    new_secret = oauth_client_service.rotate_secret(
+    new_secret = await oauth_client_service.rotate_secret(
         client_id=client_id,
         requested_by=current_user,
     )
@@ -56,3 +68,78 @@ def rotate_client_secret(
         "client_id": client_id,
         "client_secret": new_secret,
     }
+
+
+@router.post("/{client_id}/deactivate")
+async def deactivate_client(
+    client_id: str,
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
+    oauth_client_service: Annotated[
+        IOAuthClientService, Depends(get_oauth_client_service)
+    ],
+):
+    await oauth_client_service.deactivate_client(
+        client_id=client_id,
+        requested_by=current_user,
+    )
+
+    return {
+        "client_id": client_id,
+        "is_active": False,
+    }
+
+
+@router.put("/{client_id}/scope")
+async def update_client_scope(
+    client_id: str,
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
+    oauth_client_service: Annotated[
+        IOAuthClientService, Depends(get_oauth_client_service)
+    ],
+    payload: ClientScopeUpdate,
+):
+    scopes = (payload.scope or "").split() or None
+    await oauth_client_service.update_scopes(
+        client_id=client_id,
+        scopes=scopes,
+        requested_by=current_user,
+    )
+
+    return {
+        "client_id": client_id,
+        "scope": " ".join(scopes) if scopes else None,
+    }
+
+
+@router.post("/import")
+async def import_clients(
+    request: Request,
+    current_user: Annotated[UserSnapshot, Depends(get_admin_required)],
+    oauth_client_service: Annotated[
+        IOAuthClientService, Depends(get_oauth_client_service)
+    ],
+) -> StreamingResponse:
+    """
+    Bulk client registration for admins.
+
+    The body is NDJSON, one ClientImportRecord per line; every imported
+    client is owned by the calling admin. The response streams one NDJSON
+    result per non-empty input line, in input order, as each chunk commits.
+    Created clients' plain secrets are only ever shown in this response.
+    """
+    # Read up front: once the response starts streaming, Starlette consumes
+    # the request's receive channel to watch for client disconnects
+    body = await request.body()
+    results = oauth_client_service.import_clients(
+        _iter_lines(body), owner_id=current_user.id
+    )
+
+    async def stream():
+        async for result in results:
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store"},
+    )
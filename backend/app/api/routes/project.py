@@ -1,18 +1,18 @@
 from typing import List, Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import select
-from app.core.database import SessionDep
-from app.models.user import User
+from app.core.database import AsyncSessionDep
+from app.core.scope_registry import scope_registry
 from app.models.project import Project
 from app.schemas.project import ProjectCreate, ProjectRead, ProjectUpdate
-from app.dependencies.auth import get_access_token_required, get_user_from_access_token
+from app.dependencies.auth import get_access_token_required, get_token_principal
+from app.schemas.user.user import TokenPrincipal
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
 def check_scope(required_scope: str):
-    def _check(token_data: Annotated[dict, Depends(get_access_token_required)]):
-        scopes = token_data.get("scope", "").split()
-        if required_scope not in scopes:
+    async def _check(token_data: Annotated[dict, Depends(get_access_token_required)]):
+        if not token_data.get("scope_mask", 0) & scope_registry.bit(required_scope):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Missing required scope: {required_scope}"
@@ -21,48 +21,48 @@ def check_scope(required_scope: str):
     return _check
 
 @router.post("/", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     project_in: ProjectCreate,
-    session: SessionDep,
-    current_user: Annotated[User, Depends(get_user_from_access_token)],
+    session: AsyncSessionDep,
+    current_user: Annotated[TokenPrincipal, Depends(get_token_principal)],
     _: Annotated[dict, Depends(check_scope("create"))]
 ):
     project = Project(**project_in.model_dump(), user_id=current_user.id)
     session.add(project)
-    session.commit()
-    session.refresh(project)
+    await session.commit()
+    await session.refresh(project)
     return project
 
 @router.get("/", response_model=List[ProjectRead])
-def read_projects(
-    session: SessionDep,
-    current_user: Annotated[User, Depends(get_user_from_access_token)],
+async def read_projects(
+    session: AsyncSessionDep,
+    current_user: Annotated[TokenPrincipal, Depends(get_token_principal)],
     _: Annotated[dict, Depends(check_scope("read"))]
 ):
-    projects = session.exec(select(Project).where(Project.user_id == current_user.id)).all()
-    return projects
+    result = await session.exec(select(Project).where(Project.user_id == current_user.id))
+    return result.all()
 
 @router.get("/{project_id}", response_model=ProjectRead)
-def read_project(
+async def read_project(
     project_id: str,
-    session: SessionDep,
-    current_user: Annotated[User, Depends(get_user_from_access_token)],
+    session: AsyncSessionDep,
+    current_user: Annotated[TokenPrincipal, Depends(get_token_principal)],
     _: Annotated[dict, Depends(check_scope("read"))]
 ):
-    project = session.get(Project, project_id)
+    project = await session.get(Project, project_id)
     if not project or project.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 @router.patch("/{project_id}", response_model=ProjectRead)
-def update_project(
+async def update_project(
     project_id: str,
     project_in: ProjectUpdate,
-    session: SessionDep,
-    current_user: Annotated[User, Depends(get_user_from_access_token)],
+    session: AsyncSessionDep,
+    current_user: Annotated[TokenPrincipal, Depends(get_token_principal)],
     _: Annotated[dict, Depends(check_scope("update"))]
 ):
-    project = session.get(Project, project_id)
+    project = await session.get(Project, project_id)
     if not project or project.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -71,21 +71,21 @@ def update_project(
         setattr(project, key, value)
     
     session.add(project)
-    session.commit()
-    session.refresh(project)
+    await session.commit()
+    await session.refresh(project)
     return project
 
 @router.delete("/{project_id}")
-def delete_project(
+async def delete_project(
     project_id: str,
-    session: SessionDep,
-    current_user: Annotated[User, Depends(get_user_from_access_token)],
+    session: AsyncSessionDep,
+    current_user: Annotated[TokenPrincipal, Depends(get_token_principal)],
     _: Annotated[dict, Depends(check_scope("delete"))]
 ):
-    project = session.get(Project, project_id)
+    project = await session.get(Project, project_id)
     if not project or project.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    session.delete(project)
-    session.commit()
+    await session.delete(project)
+    await session.commit()
     return {"ok": True}
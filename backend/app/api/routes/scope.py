@@ -0,0 +1,30 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+
+from app.core.scope_registry import scope_registry
+from app.dependencies.auth import get_admin_required
+from app.schemas.scope import ScopeRead, ScopeRegister
+from app.schemas.user.user import UserSnapshot
+
+
+router = APIRouter(prefix="/scopes", tags=["Scopes"])
+
+
+@router.get("")
+async def list_scopes() -> list[str]:
+    """Every registered scope, in the order their bits were assigned."""
+    return scope_registry.names
+
+
+@router.post("", status_code=201)
+async def register_scope(
+    payload: ScopeRegister,
+    _admin: Annotated[UserSnapshot, Depends(get_admin_required)],
+) -> ScopeRead:
+    """
+    Registers a scope (admin only). It can be requested and checked on this
+    worker right away and on the others after their next registry refresh
+    (SCOPE_REFRESH_INTERVAL).
+    """
+    scope = await scope_registry.register(payload.name, payload.description)
+    return ScopeRead(name=scope.name, description=scope.description)
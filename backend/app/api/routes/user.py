@@ -2,16 +2,20 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 
-from app.dependencies.auth import get_user_required
+from app.core.database import AsyncSessionDep
+from app.core.revocation import revocation_list
+from app.core.session_store import refresh_user_sessions
+from app.dependencies.auth import get_admin_required, get_user_required
 from app.models.user import User
+from app.schemas.user.user import UserRoleUpdate, UserSnapshot
 
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get(path="/me")
-def me(
-    current_user: Annotated[User, Depends(get_user_required)],
+async def me(
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
 ):
     try:
         return current_user
@@ -22,3 +26,39 @@ def me(
         return JSONResponse(
             status_code=500, content={"detail": "Internal Server Error"}
         )
+
+
+@router.post(path="/me/revoke-tokens")
+async def revoke_my_tokens(
+    current_user: Annotated[UserSnapshot, Depends(get_user_required)],
+):
+    """
+    Invalidates every access and refresh token issued to the current user,
+    across all clients. The Auth Server session stays logged in.
+    """
+    await revocation_list.revoke_user(current_user.id)
+    return {"message": "All tokens revoked successfully"}
+
+
+@router.put(path="/{user_id}/role")
+async def update_role(
+    user_id: str,
+    data: UserRoleUpdate,
+    session: AsyncSessionDep,
+    _admin: Annotated[UserSnapshot, Depends(get_admin_required)],
+):
+    """
+    Changes a user's role (admin only). The user's open sessions pick up
+    the new role on their next request; no new login is needed.
+    """
+    user = await session.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user.role = data.role.value
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+
+    await refresh_user_sessions(user)
+    return UserSnapshot(id=user.id, email=user.email, role=user.role)
@@ -1,5 +1,12 @@
+import os
+
 import bcrypt
 
+from app.core.hashing_executor import bulk_hashing_executor, hashing_executor
+
+# Work factor of new hashes; existing hashes keep the cost they were made with
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 
 def hash_text(plain_text: str) -> str:
     """Hashes the plain text using bcrypt.
@@ -10,7 +17,9 @@ def hash_text(plain_text: str) -> str:
     Returns:
         str: The hashed text.
     """
-    hashed = bcrypt.hashpw(plain_text.encode("utf-8"), bcrypt.gensalt())
+    hashed = hashing_executor.run(
+        bcrypt.hashpw, plain_text.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    )
     return hashed.decode("utf-8")
 
 
@@ -22,4 +31,50 @@ def verify_text(plain_text: str, hashed_text: str) -> bool:
     Returns:
         bool: True if the plain text matches the hash, False otherwise.
     """
-    return bcrypt.checkpw(plain_text.encode("utf-8"), hashed_text.encode("utf-8"))
+    return hashing_executor.run(
+        bcrypt.checkpw, plain_text.encode("utf-8"), hashed_text.encode("utf-8")
+    )
+
+
+async def hash_text_async(plain_text: str) -> str:
+    """Hashes the plain text using bcrypt without blocking the event loop.
+
+    Args:
+        plain_text (str): The text to be hashed.
+
+    Returns:
+        str: The hashed text.
+    """
+    hashed = await hashing_executor.run_async(
+        bcrypt.hashpw, plain_text.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    )
+    return hashed.decode("utf-8")
+
+
+async def hash_many_async(plain_texts: list[str]) -> list[str]:
+    """Hashes many texts in parallel on the bulk hashing pool.
+
+    Args:
+        plain_texts (list[str]): The texts to be hashed.
+
+    Returns:
+        list[str]: The hashed texts, in the same order.
+    """
+    hashed = await bulk_hashing_executor.map_async(
+        bcrypt.hashpw,
+        [(text.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)) for text in plain_texts],
+    )
+    return [h.decode("utf-8") for h in hashed]
+
+
+async def verify_text_async(plain_text: str, hashed_text: str) -> bool:
+    """Verifies plain text against a bcrypt hash without blocking the event loop.
+    Args:
+        plain_text (str): The text to be verified.
+        hashed_text (str): The hashed text to compare against.
+    Returns:
+        bool: True if the plain text matches the hash, False otherwise.
+    """
+    return await hashing_executor.run_async(
+        bcrypt.checkpw, plain_text.encode("utf-8"), hashed_text.encode("utf-8")
+    )
@@ -0,0 +1,38 @@
+import os
+import time
+
+from app.core.metrics import register_stats
+from app.core.ttl_cache import TTLCache
+
+# Set to false to sign a fresh token on every client_credentials request
+CLIENT_TOKEN_REUSE = os.getenv("CLIENT_TOKEN_REUSE", "true").lower() != "false"
+# A cached token is only handed out while it has more than this many
+# seconds left, so callers never receive one that is about to expire
+CLIENT_TOKEN_REUSE_MARGIN = int(os.getenv("CLIENT_TOKEN_REUSE_MARGIN", "300"))
+CLIENT_TOKEN_CACHE_SIZE = int(os.getenv("CLIENT_TOKEN_CACHE_SIZE", "4096"))
+
+# Entries expire REUSE_MARGIN before their token; the default TTL is never used
+client_token_cache: TTLCache[tuple[str, str], tuple[str, dict]] = TTLCache(
+    max_size=CLIENT_TOKEN_CACHE_SIZE if CLIENT_TOKEN_REUSE else 0, default_ttl=0
+)
+register_stats("cache", "client_token", client_token_cache.stats)
+
+
+def _key(client_id: str, scopes: list[str]) -> tuple[str, str]:
+    return client_id, " ".join(sorted(set(scopes)))
+
+
+def get_reusable_token(client_id: str, scopes: list[str]) -> tuple[str, dict] | None:
+    """A token issued earlier to the client for the same scope set, with its
+    claims, if it still has more than CLIENT_TOKEN_REUSE_MARGIN left.
+
+    The cache is per process. Callers must still check the claims against
+    the revocation list before handing the token out.
+    """
+    return client_token_cache.get(_key(client_id, scopes))
+
+
+def remember_token(client_id: str, scopes: list[str], token: str, claims: dict):
+    ttl = claims["exp"] - time.time() - CLIENT_TOKEN_REUSE_MARGIN
+    if ttl > 0:
+        client_token_cache.set(_key(client_id, scopes), (token, claims), ttl=ttl)
@@ -0,0 +1,114 @@
+import time
+
+from app.core.redis_instance import LazyAsyncRedis
+
+redis_client = LazyAsyncRedis()
+
+CONSENT_TTL = 60 * 60 * 24 * 30  # 30 days
+
+# Replaces a client's granted scopes: drops its old members, adds the new ones
+_GRANT_SCRIPT = """
+local prefix = ARGV[1] .. ' '
+for _, member in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    if string.sub(member, 1, #prefix) == prefix then
+        redis.call('SREM', KEYS[1], member)
+    end
+end
+for i = 4, #ARGV do
+    redis.call('SADD', KEYS[1], prefix .. ARGV[i])
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+"""
+
+# Removes every member and grant entry belonging to the given clients
+_REVOKE_SCRIPT = """
+local clients = {}
+for i = 1, #ARGV do
+    clients[ARGV[i]] = true
+end
+for _, member in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    local client_id = string.match(member, '^(%S+) ')
+    if clients[client_id] then
+        redis.call('SREM', KEYS[1], member)
+    end
+end
+redis.call('HDEL', KEYS[2], unpack(ARGV))
+"""
+
+_grant = redis_client.register_script(_GRANT_SCRIPT)
+_revoke = redis_client.register_script(_REVOKE_SCRIPT)
+
+
+def _scopes_key(user_id: str) -> str:
+    return f"consents:{user_id}"
+
+
+def _grants_key(user_id: str) -> str:
+    return f"consent_grants:{user_id}"
+
+
+def _member(client_id: str, scope: str) -> str:
+    return f"{client_id} {scope}"
+
+
+def _is_current(granted_at: str | None, now: float) -> bool:
+    return granted_at is not None and now - int(granted_at) < CONSENT_TTL
+
+
+async def has_consent(user_id: str, client_id: str, scopes: list[str]) -> bool:
+    """True if the user granted the client every one of `scopes`.
+
+    A user's grants live in one set of "client_id scope" members plus a hash
+    of when each client was granted, so the subset check is a single
+    pipelined SMISMEMBER and HGET.
+    """
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hget(_grants_key(user_id), client_id)
+        if scopes:
+            pipe.smismember(_scopes_key(user_id), [_member(client_id, s) for s in scopes])
+        results = await pipe.execute()
+
+    if not _is_current(results[0], time.time()):
+        return False
+    return not scopes or all(results[1])
+
+
+async def grant_consent(user_id: str, client_id: str, scopes: list[str]):
+    """Record the scopes a user granted a client, replacing any earlier grant."""
+    await _grant(
+        keys=[_scopes_key(user_id), _grants_key(user_id)],
+        args=[client_id, int(time.time()), CONSENT_TTL, *scopes],
+    )
+
+
+async def list_consents(user_id: str) -> dict[str, dict]:
+    """All clients the user currently has a grant for, with their scopes."""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.smembers(_scopes_key(user_id))
+        pipe.hgetall(_grants_key(user_id))
+        members, grants = await pipe.execute()
+
+    now = time.time()
+    consents = {
+        client_id: {"scopes": [], "granted_at": int(granted_at)}
+        for client_id, granted_at in grants.items()
+        if _is_current(granted_at, now)
+    }
+    for member in members:
+        client_id, scope = member.split(" ", 1)
+        if client_id in consents:
+            consents[client_id]["scopes"].append(scope)
+
+    for consent in consents.values():
+        consent["scopes"].sort()
+    return consents
+
+
+async def revoke_consents(user_id: str, client_ids: list[str] | None = None):
+    """Revoke the user's grants for `client_ids`, or for every client."""
+    if client_ids is None:
+        await redis_client.delete(_scopes_key(user_id), _grants_key(user_id))
+    elif client_ids:
+        await _revoke(keys=[_scopes_key(user_id), _grants_key(user_id)], args=client_ids)
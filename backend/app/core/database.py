@@ -1,17 +1,42 @@
 from typing import Annotated
 from fastapi import Depends
-from sqlmodel import Session, create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 import os
 
+from app.core.metrics import TimedQueuePool, instrument_engine
+from app.core.tracing import trace_engine
+
 
 sqlite_url = os.getenv("POSTGRES_URL")
-connect_args = {"check_same_thread": False}
-engine = create_engine(str(sqlite_url))
 
 
-def get_session():
-    with Session(engine) as session:
+def _to_async_url(url: str) -> URL:
+    """Swaps the sync DBAPI driver of a database URL for its asyncio driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg")
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite")
+    return parsed
+
+
+async_database_url = os.getenv("POSTGRES_ASYNC_URL") or _to_async_url(str(sqlite_url))
+# SQLite picks its own pool class; everything else gets the timed queue pool
+async_engine = create_async_engine(
+    async_database_url,
+    **({} if make_url(str(async_database_url)).get_backend_name() == "sqlite"
+       else {"poolclass": TimedQueuePool}),
+)
+instrument_engine(async_engine.sync_engine)
+trace_engine(async_engine.sync_engine)
+
+
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
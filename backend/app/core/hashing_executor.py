@@ -0,0 +1,142 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+from threading import BoundedSemaphore, Lock
+import time
+from typing import Callable, TypeVar
+
+from app.core.metrics import hash_duration, hash_queue_duration, register_stats
+from app.core.tracing import current_span, record_span
+from app.services.exceptions import HashingPoolSaturated
+
+T = TypeVar("T")
+
+HASH_MAX_CONCURRENCY = int(os.getenv("HASH_MAX_CONCURRENCY", str(os.cpu_count() or 2)))
+HASH_MAX_QUEUE = int(os.getenv("HASH_MAX_QUEUE", "32"))
+# Separate pool for bulk imports, so they never take request-path capacity
+BULK_HASH_MAX_CONCURRENCY = int(
+    os.getenv("BULK_HASH_MAX_CONCURRENCY", str(max((os.cpu_count() or 2) // 2, 1)))
+)
+BULK_HASH_MAX_QUEUE = int(os.getenv("BULK_HASH_MAX_QUEUE", "1024"))
+
+
+class _Timing:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+        }
+
+
+class HashingExecutor:
+    """Runs bcrypt work on its own sized thread pool.
+
+    bcrypt releases the GIL, so a dedicated pool keeps password and secret
+    hashing off the request threadpool. At most `max_workers` hashes run at
+    once and at most `max_queue` more may wait; anything beyond that is
+    rejected immediately with `HashingPoolSaturated` (503) instead of queueing.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hashing"
+        )
+        self._slots = BoundedSemaphore(max_workers + max_queue)
+        self._lock = Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._queue_wait = _Timing()
+        self._duration = _Timing()
+
+    def submit(self, fn: Callable[..., T], *args) -> "Future[T]":
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingPoolSaturated("Hashing capacity exhausted, retry later")
+
+        submitted_at = time.perf_counter()
+        parent_span = current_span()
+        with self._lock:
+            self._in_flight += 1
+
+        def task() -> T:
+            started_at = time.perf_counter()
+            started_ns = time.time_ns()
+            try:
+                return fn(*args)
+            finally:
+                finished_at = time.perf_counter()
+                record_span(
+                    parent_span, f"bcrypt.{fn.__name__}", started_ns, time.time_ns(),
+                    queue_wait_ms=(started_at - submitted_at) * 1000,
+                )
+                with self._lock:
+                    self._queue_wait.observe(started_at - submitted_at)
+                    self._duration.observe(finished_at - started_at)
+                hash_queue_duration.observe(started_at - submitted_at)
+                hash_duration.labels(fn.__name__).observe(finished_at - started_at)
+
+        future = self._executor.submit(task)
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args) -> T:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    async def map_async(self, fn: Callable[..., T], args_list: list[tuple]) -> list[T]:
+        """Runs `fn` over every argument tuple, in order of the results.
+
+        At most twice `max_workers` calls are submitted at a time, so a large
+        batch waits for the pool instead of overflowing its queue.
+        """
+        limit = asyncio.Semaphore(2 * self.max_workers)
+
+        async def run_one(args: tuple) -> T:
+            async with limit:
+                return await self.run_async(fn, *args)
+
+        return await asyncio.gather(*(run_one(args) for args in args_list))
+
+    def _release(self, _future: Future):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "rejected": self._rejected,
+                "queue_wait": self._queue_wait.as_dict(),
+                "hash_duration": self._duration.as_dict(),
+            }
+
+
+hashing_executor = HashingExecutor(
+    max_workers=HASH_MAX_CONCURRENCY, max_queue=HASH_MAX_QUEUE
+)
+register_stats("pool", "hashing", hashing_executor.stats)
+
+bulk_hashing_executor = HashingExecutor(
+    max_workers=BULK_HASH_MAX_CONCURRENCY, max_queue=BULK_HASH_MAX_QUEUE
+)
+register_stats("pool", "bulk_hashing", bulk_hashing_executor.stats)
@@ -0,0 +1,195 @@
+import asyncio
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+import secrets
+import time
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+import jwt
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+from app.core.redis_instance import LazyAsyncRedis
+from app.core.tracing import span
+
+log = logging.getLogger("uvicorn")
+redis_client = LazyAsyncRedis()
+
+SECRET_JWT = os.getenv("SECRET_JWT")
+JWT_SIGNING_ALG = os.getenv("JWT_SIGNING_ALG", "RS256")  # RS256 or EdDSA
+JWT_KEY_ROTATION_INTERVAL = int(os.getenv("JWT_KEY_ROTATION_INTERVAL", str(60 * 60 * 24 * 7)))
+# Retired keys stay published until every token they signed has expired
+JWT_KEY_RETENTION = int(os.getenv("JWT_KEY_RETENTION", str(60 * 60 * 24 * 31)))
+JWT_KEY_REFRESH_INTERVAL = int(os.getenv("JWT_KEY_REFRESH_INTERVAL", "60"))
+JWKS_MAX_AGE = int(os.getenv("JWKS_MAX_AGE", "300"))
+# A new key is only used for signing once every worker and every JWKS cache
+# can have seen it
+JWT_KEY_ACTIVATION_DELAY = JWKS_MAX_AGE + 2 * JWT_KEY_REFRESH_INTERVAL
+
+SIGNING_KEYS_KEY = "jwt:signing_keys"
+ROTATION_LOCK_KEY = "jwt:signing_keys:rotation_lock"
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    alg: str
+    created_at: int
+    private_key: Any
+    public_key: Any
+    public_jwk: dict
+
+
+def _key_encryption() -> serialization.KeySerializationEncryption:
+    if SECRET_JWT:
+        return serialization.BestAvailableEncryption(SECRET_JWT.encode("utf-8"))
+    return serialization.NoEncryption()
+
+
+def _generate_record(alg: str) -> dict:
+    if alg == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=_key_encryption(),
+    )
+    return {"alg": alg, "created_at": int(time.time()), "pem": pem.decode("ascii")}
+
+
+def _parse_record(kid: str, record: dict) -> SigningKey:
+    password = SECRET_JWT.encode("utf-8") if SECRET_JWT else None
+    private_key = serialization.load_pem_private_key(
+        record["pem"].encode("ascii"), password=password
+    )
+    public_key = private_key.public_key()
+    if record["alg"] == "EdDSA":
+        public_jwk = OKPAlgorithm.to_jwk(public_key, as_dict=True)
+    else:
+        public_jwk = RSAAlgorithm.to_jwk(public_key, as_dict=True)
+
+    return SigningKey(
+        kid=kid,
+        alg=record["alg"],
+        created_at=int(record["created_at"]),
+        private_key=private_key,
+        public_key=public_key,
+        public_jwk={**public_jwk, "kid": kid, "alg": record["alg"], "use": "sig"},
+    )
+
+
+class KeyRing:
+    """Asymmetric token signing keys shared by all workers through Redis.
+
+    Keys are stored (encrypted with SECRET_JWT when set) in one Redis hash and
+    parsed once per worker. `refresh` picks up keys created by other workers,
+    rotates in a new key every JWT_KEY_ROTATION_INTERVAL and prunes keys past
+    their retention, so old and new keys overlap in the JWKS.
+    """
+
+    def __init__(self):
+        self._keys: dict[str, SigningKey] = {}
+        self._active: SigningKey | None = None
+        self._jwks_body = b'{"keys":[]}'
+        self._jwks_etag = ""
+
+    async def refresh(self):
+        records = await self._load_records()
+        now = int(time.time())
+
+        newest = max((r["created_at"] for r in records.values()), default=None)
+        if newest is None or now - newest >= JWT_KEY_ROTATION_INTERVAL:
+            await self._rotate()
+            records = await self._wait_for_keys()
+
+        self._apply(records, now)
+        await self._prune(now)
+
+    async def _load_records(self) -> dict[str, dict]:
+        raw = await redis_client.hgetall(SIGNING_KEYS_KEY)
+        return {kid: json.loads(value) for kid, value in raw.items()}
+
+    async def _rotate(self):
+        acquired = await redis_client.set(ROTATION_LOCK_KEY, "1", nx=True, ex=30)
+        if not acquired:
+            return
+
+        kid = secrets.token_urlsafe(12)
+        record = await asyncio.to_thread(_generate_record, JWT_SIGNING_ALG)
+        await redis_client.hset(SIGNING_KEYS_KEY, kid, json.dumps(record))
+        log.info(f"Generated {JWT_SIGNING_ALG} signing key {kid}")
+
+    async def _wait_for_keys(self) -> dict[str, dict]:
+        # Another worker may hold the rotation lock while generating the key
+        for _ in range(50):
+            records = await self._load_records()
+            if records:
+                return records
+            await asyncio.sleep(0.1)
+        raise RuntimeError("No JWT signing key available")
+
+    def _apply(self, records: dict[str, dict], now: int):
+        keys = {
+            kid: self._keys.get(kid) or _parse_record(kid, record)
+            for kid, record in records.items()
+        }
+        by_age = sorted(keys.values(), key=lambda k: k.created_at, reverse=True)
+        ready = [k for k in by_age if now - k.created_at >= JWT_KEY_ACTIVATION_DELAY]
+        # On a fresh deployment there is nothing older to fall back to
+        self._active = ready[0] if ready else by_age[-1]
+
+        if keys.keys() != self._keys.keys():
+            self._jwks_body = json.dumps(
+                {"keys": [k.public_jwk for k in by_age]}, separators=(",", ":")
+            ).encode("utf-8")
+            self._jwks_etag = f'"{hashlib.sha256(self._jwks_body).hexdigest()[:16]}"'
+        self._keys = keys
+
+    async def _prune(self, now: int):
+        expired = [
+            key.kid
+            for key in self._keys.values()
+            if key is not self._active
+            and now - key.created_at > JWT_KEY_ROTATION_INTERVAL + JWT_KEY_RETENTION
+        ]
+        if expired:
+            await redis_client.hdel(SIGNING_KEYS_KEY, *expired)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(JWT_KEY_REFRESH_INTERVAL)
+            try:
+                await self.refresh()
+            except Exception as e:
+                log.warning(f"Signing key refresh failed: {e}")
+
+    def sign(self, claims: dict) -> str:
+        if self._active is None:
+            raise RuntimeError("Signing keys have not been loaded")
+        key = self._active
+        with span("jwt.sign", alg=key.alg):
+            return jwt.encode(
+                claims, key.private_key, algorithm=key.alg, headers={"kid": key.kid}
+            )
+
+    def decode(self, token: str, **options) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid) if kid else None
+        if key is None:
+            raise jwt.InvalidTokenError("Unknown signing key")
+        with span("jwt.decode", alg=key.alg):
+            return jwt.decode(token, key.public_key, algorithms=[key.alg], **options)
+
+    @property
+    def jwks(self) -> tuple[bytes, str]:
+        return self._jwks_body, self._jwks_etag
+
+
+key_ring = KeyRing()
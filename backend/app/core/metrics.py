@@ -0,0 +1,215 @@
+import os
+import time
+from typing import Callable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Sub-millisecond buckets for Redis and SQL, wider ones for HTTP and bcrypt
+FAST_BUCKETS = (0.0002, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+SLOW_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status; _count is the request count",
+    ["method", "route", "status"],
+    buckets=SLOW_BUCKETS,
+)
+redis_command_duration = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency by command and key family",
+    ["command", "key_family"],
+    buckets=FAST_BUCKETS,
+)
+db_pool_checkout_duration = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=FAST_BUCKETS,
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time by statement type",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+hash_duration = Histogram(
+    "bcrypt_duration_seconds",
+    "Time spent in bcrypt, excluding queueing",
+    ["operation"],
+    buckets=SLOW_BUCKETS,
+)
+hash_queue_duration = Histogram(
+    "bcrypt_queue_seconds",
+    "Time bcrypt work waited for a hashing thread",
+    buckets=SLOW_BUCKETS,
+)
+tokens_issued = Counter(
+    "oauth_tokens_issued_total",
+    "Tokens signed by the token endpoint by grant type",
+    ["grant_type"],
+)
+
+
+#####################################
+# Redis
+#####################################
+
+
+def redis_key_family(key) -> str:
+    """Collapses a Redis key to a low-cardinality family label.
+
+    Keys are namespaced as "family:rest", except authorization codes which
+    are stored as "{client_id}:auth_code:{code}".
+    """
+    if not isinstance(key, str):
+        return "none"
+    if ":auth_code:" in key:
+        return "auth_code"
+    return key.split(":", 1)[0]
+
+
+def observe_redis(command: str, key, seconds: float):
+    redis_command_duration.labels(command, redis_key_family(key)).observe(seconds)
+
+
+#####################################
+# SQLAlchemy
+#####################################
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_duration.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine):
+    """Records the execution time of every statement run on `engine`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        db_query_duration.labels(operation).observe(time.perf_counter() - started)
+
+
+#####################################
+# In-process caches and pools
+#####################################
+
+_stats_sources: dict[str, tuple[str, Callable[[], dict]]] = {}
+
+
+def register_stats(kind: str, name: str, stats: Callable[[], dict]):
+    """Exposes a component's `stats()` dict at scrape time.
+
+    `kind` is "cache" for TTLCache-style stats (hits, misses, evictions,
+    size, max_size) or "pool" for connection/worker pools; every numeric
+    value becomes a gauge. Nothing is recorded on the request path.
+    """
+    _stats_sources[name] = (kind, stats)
+
+
+class _StatsCollector:
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache misses", labels=["cache"])
+        evictions = CounterMetricFamily("cache_evictions", "Cache evictions", labels=["cache"])
+        size = GaugeMetricFamily("cache_size", "Entries in the cache", labels=["cache"])
+        max_size = GaugeMetricFamily("cache_max_size", "Cache capacity", labels=["cache"])
+        pool = GaugeMetricFamily("pool_stat", "Pool statistics", labels=["pool", "stat"])
+
+        for name, (kind, stats) in _stats_sources.items():
+            values = stats()
+            if kind == "cache":
+                hits.add_metric([name], values["hits"])
+                misses.add_metric([name], values["misses"])
+                evictions.add_metric([name], values["evictions"])
+                size.add_metric([name], values["size"])
+                max_size.add_metric([name], values["max_size"])
+                continue
+            for stat, value in values.items():
+                if isinstance(value, (int, float)):
+                    pool.add_metric([name, stat], value)
+
+        yield from (hits, misses, evictions, size, max_size, pool)
+
+
+REGISTRY.register(_StatsCollector())
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """The metrics in Prometheus text format, with their content type.
+
+    Under a multi-worker server with PROMETHEUS_MULTIPROC_DIR set, the
+    counters and histograms of all workers are merged; the per-process
+    cache and pool gauges are only available in single-process mode.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+#####################################
+# HTTP
+#####################################
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request.
+
+    Requests are labelled with the matched route's path template (never the
+    raw path) so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.labels(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status_code),
+            ).observe(time.perf_counter() - started)
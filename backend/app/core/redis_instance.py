@@ -1,5 +1,88 @@
+import os
 from threading import Lock
+import time
 import redis
+import redis.asyncio
+import redis.asyncio.client
+from redis.commands.core import AsyncScript
+
+from app.core.metrics import observe_redis, redis_key_family, register_stats
+from app.core.tracing import span
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "2"))
+REDIS_READ_TIMEOUT = float(os.getenv("REDIS_READ_TIMEOUT", "2"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+# How long a command waits for a free connection once all are checked out
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "2"))
+
+
+def _pool_kwargs() -> dict:
+    return {
+        "max_connections": REDIS_MAX_CONNECTIONS,
+        "timeout": REDIS_POOL_TIMEOUT,
+        "socket_connect_timeout": REDIS_CONNECT_TIMEOUT,
+        "socket_timeout": REDIS_READ_TIMEOUT,
+        "health_check_interval": REDIS_HEALTH_CHECK_INTERVAL,
+        "decode_responses": True,
+    }
+
+
+def _pool_stats(pool: redis.asyncio.ConnectionPool) -> dict:
+    in_use = len(getattr(pool, "_in_use_connections", ()))
+    available = len(getattr(pool, "_available_connections", ()))
+    return {
+        "max_connections": pool.max_connections,
+        "created_connections": in_use + available,
+        "in_use_connections": in_use,
+        "available_connections": available,
+    }
+
+
+def _command_key(args: tuple):
+    """The first key a command touches, for the latency key-family label."""
+    name = str(args[0]).upper()
+    if name.startswith("SCRIPT"):
+        return None
+    if name in ("EVALSHA", "EVAL"):
+        return args[3] if len(args) > 3 and int(args[2]) > 0 else None
+    if name in ("XREAD", "XREADGROUP"):
+        upper = [str(a).upper() for a in args]
+        return args[upper.index("STREAMS") + 1] if "STREAMS" in upper else None
+    return args[1] if len(args) > 1 else None
+
+
+class InstrumentedPipeline(redis.asyncio.client.Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        stack = self.command_stack
+        key = _command_key(stack[0][0]) if stack else None
+        command = "MULTI" if self.is_transaction else "PIPELINE"
+        started = time.perf_counter()
+        try:
+            with span(f"redis {command}", key_family=redis_key_family(key), commands=len(stack)):
+                return await super().execute(raise_on_error)
+        finally:
+            observe_redis(command, key, time.perf_counter() - started)
+
+
+class InstrumentedRedis(redis.asyncio.Redis):
+    """Async client that records the latency of every command and pipeline,
+    as metrics and as spans of the current trace."""
+
+    async def execute_command(self, *args, **options):
+        command, key = str(args[0]).upper(), _command_key(args)
+        started = time.perf_counter()
+        try:
+            with span(f"redis {command}", key_family=redis_key_family(key)):
+                return await super().execute_command(*args, **options)
+        finally:
+            observe_redis(command, key, time.perf_counter() - started)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None):
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
 
 
 class SingletonMeta(type):
@@ -8,15 +91,47 @@ class SingletonMeta(type):
     _lock = Lock()
 
     def __call__(self, *args, **kwds):
-        with self._lock:
-            instance = super().__call__(*args, **kwds)
-            self._instances[self] = instance
+        if self not in self._instances:
+            with self._lock:
+                if self not in self._instances:
+                    self._instances[self] = super().__call__(*args, **kwds)
         return self._instances[self]
 
 
-class RedisSingleton(metaclass=SingletonMeta):
+class AsyncRedisSingleton(metaclass=SingletonMeta):
+    """Process-wide async Redis client backed by one explicitly sized pool.
+
+    The pool never opens more than REDIS_MAX_CONNECTIONS sockets; once they
+    are all checked out, further commands wait up to REDIS_POOL_TIMEOUT for
+    one to be released and only then fail with a ConnectionError, so a burst
+    of requests queues instead of erroring. Connections are opened lazily on
+    the running event loop.
+    """
+
     def __init__(self):
-        self.conn = redis.Redis(host="localhost", port=6379, decode_responses=True)
+        self.pool = redis.asyncio.BlockingConnectionPool.from_url(REDIS_URL, **_pool_kwargs())
+        self.conn = InstrumentedRedis(connection_pool=self.pool)
+        register_stats("pool", "redis", self.pool_stats)
 
-    def getInstance(self) -> redis.Redis:
+    def getInstance(self) -> redis.asyncio.Redis:
         return self.conn
+
+    def pool_stats(self) -> dict:
+        return _pool_stats(self.pool)
+
+
+class LazyAsyncRedis:
+    """Module-level handle on the shared async client.
+
+    Modules keep `redis_client = LazyAsyncRedis()` at import time; the
+    client and its pool are only created on first use, so importing the app
+    touches no Redis state, and a client swapped into AsyncRedisSingleton
+    later (as the benchmarks do) is picked up everywhere.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(AsyncRedisSingleton().getInstance(), name)
+
+    def register_script(self, script: str) -> AsyncScript:
+        # Pre-encoded, so the script's SHA is computed without the client
+        return AsyncScript(self, script.encode("utf-8"))
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import os
+import time
+
+from app.core.bloom_filter import BloomFilter
+from app.core.redis_instance import LazyAsyncRedis
+
+log = logging.getLogger("uvicorn")
+redis_client = LazyAsyncRedis()
+
+REVOCATION_SYNC_INTERVAL = float(os.getenv("REVOCATION_SYNC_INTERVAL", "1"))
+REVOCATION_REBUILD_INTERVAL = float(os.getenv("REVOCATION_REBUILD_INTERVAL", "600"))
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+REVOCATION_LOG_MAXLEN = int(os.getenv("REVOCATION_LOG_MAXLEN", "100000"))
+
+# Sorted set of revoked token ids scored by the token's exp
+REVOKED_TOKENS_KEY = "revoked_tokens"
+# Current revocation epoch per user id and per client id
+USER_EPOCHS_KEY = "revocation_epochs:user"
+CLIENT_EPOCHS_KEY = "revocation_epochs:client"
+# Append-only stream the workers tail to update their local state
+REVOCATION_LOG_KEY = "revocation_log"
+
+# Bumps an epoch and logs the new value in one atomic step
+_BUMP_EPOCH_SCRIPT = """
+local epoch = redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*',
+           'kind', ARGV[2], 'key', ARGV[1], 'epoch', epoch)
+return epoch
+"""
+
+
+class RevocationList:
+    """Redis-backed token denylist with a per-worker Bloom filter in front.
+
+    The authoritative list is a sorted set of `jti`s whose entries are dropped
+    once the token's `exp` has passed. Every worker mirrors it into a local
+    Bloom filter, fed incrementally from a Redis stream, so checking a token
+    that was never revoked needs no network call. Only Bloom hits are
+    confirmed against Redis.
+
+    Whole users and clients are revoked by bumping an epoch counter. Tokens
+    carry the epochs current when they were issued (`uep`, `cep`) and are
+    stale once either falls behind; the current epochs are mirrored locally
+    through the same stream, so that check is a dictionary lookup.
+    """
+
+    def __init__(self):
+        self._bloom = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+        self._epochs: dict[str, dict[str, int]] = {"user": {}, "client": {}}
+        self._bump_epoch = redis_client.register_script(_BUMP_EPOCH_SCRIPT)
+        self._last_id = "0-0"
+        self._last_rebuild = 0.0
+
+    async def revoke(self, token_id: str, expires_at: int):
+        if expires_at <= time.time():
+            return
+
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.zadd(REVOKED_TOKENS_KEY, {token_id: expires_at})
+            pipe.xadd(
+                REVOCATION_LOG_KEY,
+                {"kind": "token", "key": token_id},
+                maxlen=REVOCATION_LOG_MAXLEN,
+                approximate=True,
+            )
+            await pipe.execute()
+        self._bloom.add(token_id)
+
+    async def is_revoked(self, token_id: str) -> bool:
+        if token_id not in self._bloom:
+            return False
+        return await redis_client.zscore(REVOKED_TOKENS_KEY, token_id) is not None
+
+    async def revoke_user(self, user_id: str):
+        """Invalidates every token issued to the user so far."""
+        await self._bump("user", USER_EPOCHS_KEY, user_id)
+
+    async def revoke_client(self, client_id: str):
+        """Invalidates every token issued to the client so far."""
+        await self._bump("client", CLIENT_EPOCHS_KEY, client_id)
+
+    async def _bump(self, kind: str, key: str, entity_id: str):
+        epoch = await self._bump_epoch(
+            keys=[key, REVOCATION_LOG_KEY],
+            args=[entity_id, kind, REVOCATION_LOG_MAXLEN],
+        )
+        self._set_epoch(kind, entity_id, int(epoch))
+
+    async def current_epochs(self, user_id: str, client_id: str) -> tuple[int, int]:
+        """Epochs to stamp on a new token, read from Redis rather than the
+        local mirror so a token minted right after a bump is not born stale."""
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hget(USER_EPOCHS_KEY, user_id)
+            pipe.hget(CLIENT_EPOCHS_KEY, client_id)
+            user_epoch, client_epoch = await pipe.execute()
+        return int(user_epoch or 0), int(client_epoch or 0)
+
+    async def current_client_epoch(self, client_id: str) -> int:
+        """Like `current_epochs`, for tokens issued to a client on its own behalf."""
+        return int(await redis_client.hget(CLIENT_EPOCHS_KEY, client_id) or 0)
+
+    def is_stale(self, claims: dict) -> bool:
+        user_epoch = self._epochs["user"].get(claims.get("sub"), 0)
+        client_epoch = self._epochs["client"].get(claims.get("client_id"), 0)
+        return claims.get("uep", 0) < user_epoch or claims.get("cep", 0) < client_epoch
+
+    def _set_epoch(self, kind: str, entity_id: str, epoch: int):
+        epochs = self._epochs[kind]
+        if epoch > epochs.get(entity_id, 0):
+            epochs[entity_id] = epoch
+
+    async def rebuild(self):
+        """Reload the filter from the sorted set, dropping expired entries."""
+        # Read the stream position first: anything revoked after it is replayed
+        # by the next sync, anything before it is already in the sorted set.
+        latest = await redis_client.xrevrange(REVOCATION_LOG_KEY, count=1)
+        last_id = latest[0][0] if latest else "0-0"
+
+        await redis_client.zremrangebyscore(REVOKED_TOKENS_KEY, "-inf", time.time())
+        token_ids = await redis_client.zrange(REVOKED_TOKENS_KEY, 0, -1)
+
+        user_epochs = await redis_client.hgetall(USER_EPOCHS_KEY)
+        client_epochs = await redis_client.hgetall(CLIENT_EPOCHS_KEY)
+
+        bloom = BloomFilter(
+            max(REVOCATION_BLOOM_CAPACITY, 2 * len(token_ids)),
+            REVOCATION_BLOOM_ERROR_RATE,
+        )
+        for token_id in token_ids:
+            bloom.add(token_id)
+
+        self._bloom = bloom
+        self._epochs = {
+            "user": {k: int(v) for k, v in user_epochs.items()},
+            "client": {k: int(v) for k, v in client_epochs.items()},
+        }
+        self._last_id = last_id
+        self._last_rebuild = time.monotonic()
+
+    async def sync(self):
+        """Apply revocations made by other workers since the last sync."""
+        while True:
+            response = await redis_client.xread({REVOCATION_LOG_KEY: self._last_id}, count=1000)
+            if not response:
+                return
+
+            _, entries = response[0]
+            for entry_id, fields in entries:
+                if fields["kind"] == "token":
+                    self._bloom.add(fields["key"])
+                else:
+                    self._set_epoch(fields["kind"], fields["key"], int(fields["epoch"]))
+                self._last_id = entry_id
+
+            if len(entries) < 1000:
+                return
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(REVOCATION_SYNC_INTERVAL)
+            try:
+                if time.monotonic() - self._last_rebuild >= REVOCATION_REBUILD_INTERVAL:
+                    await self.rebuild()
+                await self.sync()
+            except Exception as e:
+                log.warning(f"Revocation list sync failed: {e}")
+
+
+revocation_list = RevocationList()
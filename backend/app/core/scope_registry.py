@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import os
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_engine
+from app.core.redis_instance import LazyAsyncRedis
+from app.models.scope import Scope
+from app.services.exceptions import ScopeAlreadyExists
+
+log = logging.getLogger("uvicorn")
+redis_client = LazyAsyncRedis()
+
+SCOPE_REFRESH_INTERVAL = float(os.getenv("SCOPE_REFRESH_INTERVAL", "10"))
+
+# Bumped whenever the scope table changes, so workers know to reload it
+SCOPE_VERSION_KEY = "scopes:version"
+
+
+class ScopeRegistry:
+    """The scopes in the `scope` table, each mapped to one bit of a mask.
+
+    A token's granted scopes are turned into a mask once, when it is
+    verified, and every scope check after that is a single integer AND.
+    Bits are assigned when a scope is registered and never reused or
+    renumbered, so masks stay valid across reloads.
+    """
+
+    def __init__(self):
+        self._bits: dict[str, int] = {}
+        self._names: list[str] = []
+        self._version: str | None = None
+        self._fingerprint: tuple[int, int | None] = (0, None)
+        # Incremented on every load; masks computed before it are redone
+        self.generation = 0
+
+    @property
+    def names(self) -> list[str]:
+        """Every registered scope, in bit order."""
+        return self._names
+
+    def bit(self, name: str) -> int:
+        """The scope's bit as a mask, or 0 if the scope is unknown."""
+        return self._bits.get(name, 0)
+
+    def names_in(self, mask: int) -> list[str]:
+        """The registered scopes whose bits are set in `mask`, in bit order."""
+        bits = self._bits
+        return [name for name in self._names if bits[name] & mask]
+
+    def mask(self, scopes: str | None) -> int:
+        """The mask of a space-separated scope string; unknown scopes are dropped."""
+        bits = self._bits
+        mask = 0
+        for name in (scopes or "").split():
+            mask |= bits.get(name, 0)
+        return mask
+
+    async def load(self):
+        # Read the version first: a change made while loading bumps it again
+        # and is picked up by the next refresh
+        version = await redis_client.get(SCOPE_VERSION_KEY)
+        async with AsyncSession(async_engine) as session:
+            result = await session.exec(select(Scope).order_by(Scope.bit))
+            scopes = result.all()
+
+        self._bits = {scope.name: 1 << scope.bit for scope in scopes}
+        self._names = [scope.name for scope in scopes]
+        self._version = version
+        self._fingerprint = (len(scopes), scopes[-1].bit if scopes else None)
+        self.generation += 1
+
+    async def refresh(self):
+        """Reload if the scope table changed since the last load.
+
+        `register` bumps SCOPE_VERSION_KEY. Scopes added any other way (a
+        migration, plain SQL) are caught by the table's row count and
+        highest bit, which change with every insert since bits are never
+        reused.
+        """
+        if await redis_client.get(SCOPE_VERSION_KEY) != self._version:
+            await self.load()
+            return
+
+        async with AsyncSession(async_engine) as session:
+            result = await session.exec(select(func.count(), func.max(Scope.bit)))
+            count, top = result.one()
+        if (count, top) != self._fingerprint:
+            await self.load()
+
+    async def register(self, name: str, description: str | None = None) -> Scope:
+        """Add a scope on the next free bit and tell every worker to reload.
+
+        Two concurrent registrations may pick the same bit; the unique
+        constraint on `bit` makes the second one fail rather than share it.
+        Raises ScopeAlreadyExists if the name is taken.
+        """
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            existing = await session.exec(select(Scope.id).where(Scope.name == name))
+            if existing.first() is not None:
+                raise ScopeAlreadyExists(f"Scope {name} already exists")
+
+            result = await session.exec(select(func.max(Scope.bit)))
+            top = result.one()
+            scope = Scope(name=name, description=description, bit=0 if top is None else top + 1)
+            session.add(scope)
+            try:
+                await session.commit()
+            except IntegrityError:
+                raise ScopeAlreadyExists(f"Scope {name} conflicts with a concurrent registration")
+
+        await redis_client.incr(SCOPE_VERSION_KEY)
+        await self.load()
+        return scope
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(SCOPE_REFRESH_INTERVAL)
+            try:
+                await self.refresh()
+            except Exception as e:
+                log.warning(f"Scope registry refresh failed: {e}")
+
+
+scope_registry = ScopeRegistry()
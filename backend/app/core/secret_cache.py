@@ -0,0 +1,67 @@
+import hashlib
+import hmac
+import os
+import secrets
+from threading import Lock
+
+from app.core.metrics import register_stats
+from app.core.ttl_cache import TTLCache
+
+CLIENT_SECRET_CACHE_TTL = float(os.getenv("CLIENT_SECRET_CACHE_TTL", "300"))
+CLIENT_SECRET_CACHE_SIZE = int(os.getenv("CLIENT_SECRET_CACHE_SIZE", "1024"))
+
+
+class VerifiedSecretCache:
+    """Remembers (client_id, secret) pairs that recently passed bcrypt.
+
+    Entries are keyed by an HMAC fingerprint computed with a per-process key,
+    so plain secrets are never kept in memory. Each entry stores the bcrypt
+    hash it was verified against: a hit only counts if the client row still
+    carries that hash. Fingerprints also mix in a random per-client salt;
+    `invalidate` drops the salt, so entries made with it can no longer be
+    found. Salts live in a bounded TTL cache of their own: losing one only
+    costs a bcrypt check. `invalidate` only reaches this process; a secret
+    rotated by another worker stops matching once the row is reloaded, which
+    `get_client` does as soon as the client's version changes.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache: TTLCache[bytes, str] = TTLCache(max_size=max_size, default_ttl=ttl)
+        self._key = secrets.token_bytes(32)
+        self._salts: TTLCache[str, bytes] = TTLCache(max_size=max_size, default_ttl=ttl)
+        self._lock = Lock()
+
+    def _salt(self, client_id: str) -> bytes:
+        with self._lock:
+            salt = self._salts.get(client_id)
+            if salt is None:
+                salt = secrets.token_bytes(16)
+                self._salts.set(client_id, salt)
+            return salt
+
+    def _fingerprint(self, client_id: str, plain_secret: str) -> bytes:
+        message = b"\x00".join(
+            (client_id.encode("utf-8"), self._salt(client_id), plain_secret.encode("utf-8"))
+        )
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def is_verified(self, client_id: str, plain_secret: str, hashed_secret: str) -> bool:
+        cached_hash = self._cache.get(self._fingerprint(client_id, plain_secret))
+        return cached_hash is not None and hmac.compare_digest(cached_hash, hashed_secret)
+
+    def remember(self, client_id: str, plain_secret: str, hashed_secret: str):
+        self._cache.set(self._fingerprint(client_id, plain_secret), hashed_secret)
+
+    def invalidate(self, client_id: str):
+        """Drops every cached secret of a client (after rotation or deactivation)."""
+        with self._lock:
+            self._salts.pop(client_id)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+secret_cache = VerifiedSecretCache(
+    max_size=CLIENT_SECRET_CACHE_SIZE, ttl=CLIENT_SECRET_CACHE_TTL
+)
+register_stats("cache", "client_secret", secret_cache.stats)
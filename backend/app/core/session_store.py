@@ -0,0 +1,98 @@
+import json
+import secrets
+
+from app.core.redis_instance import LazyAsyncRedis
+from app.models.user import User
+from app.schemas.user.user import UserSnapshot
+
+redis_client = LazyAsyncRedis()
+
+SESSION_TTL = 60 * 60 * 24  # 24 hours
+SESSION_RECORD_VERSION = 1
+
+
+def _session_key(session_id: str) -> str:
+    return f"session:{session_id}"
+
+
+def _user_sessions_key(user_id: str) -> str:
+    return f"user_sessions:{user_id}"
+
+
+def _encode_record(user: User) -> str:
+    return json.dumps(
+        {"v": SESSION_RECORD_VERSION, "id": user.id, "email": user.email, "role": user.role},
+        separators=(",", ":"),
+    )
+
+
+async def create_session(user: User) -> str:
+    """Create a session in Redis and return the session ID.
+
+    The session stores a compact snapshot of the user so cookie-authenticated
+    requests can be served from a single Redis read. The session is also
+    indexed per user so the snapshots can be rewritten when the user changes.
+    """
+    session_id = secrets.token_urlsafe(32)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.set(name=_session_key(session_id), value=_encode_record(user), ex=SESSION_TTL)
+        pipe.sadd(_user_sessions_key(user.id), session_id)
+        pipe.expire(_user_sessions_key(user.id), SESSION_TTL)
+        await pipe.execute()
+    return session_id
+
+
+async def load_session(session_id: str) -> UserSnapshot | None:
+    """Return the user snapshot of a session, or None if it is unknown.
+
+    Records written in an older format are treated as missing, so the user is
+    asked to log in again and gets a current record.
+    """
+    raw = await redis_client.get(_session_key(session_id))
+    if not raw:
+        return None
+
+    try:
+        record = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+
+    if not isinstance(record, dict) or record.get("v") != SESSION_RECORD_VERSION:
+        return None
+
+    return UserSnapshot(id=record["id"], email=record["email"], role=record["role"])
+
+
+async def delete_session(session_id: str):
+    """Delete a session and drop it from its user's session index."""
+    raw = await redis_client.getdel(_session_key(session_id))
+    if not raw:
+        return
+
+    try:
+        user_id = json.loads(raw)["id"]
+    except (json.JSONDecodeError, TypeError, KeyError):
+        return
+    await redis_client.srem(_user_sessions_key(user_id), session_id)
+
+
+async def refresh_user_sessions(user: User):
+    """Rewrite the snapshot in every live session of a user.
+
+    Must be called after any change to the fields stored in the snapshot.
+    Sessions that already expired are dropped from the per-user index.
+    """
+    index_key = _user_sessions_key(user.id)
+    session_ids = list(await redis_client.smembers(index_key))
+    if not session_ids:
+        return
+
+    record = _encode_record(user)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for session_id in session_ids:
+            pipe.set(name=_session_key(session_id), value=record, xx=True, keepttl=True)
+        results = await pipe.execute()
+
+    expired = [sid for sid, updated in zip(session_ids, results) if not updated]
+    if expired:
+        await redis_client.srem(index_key, *expired)
@@ -0,0 +1,60 @@
+from enum import Enum
+
+from app.core.redis_instance import LazyAsyncRedis
+
+redis_client = LazyAsyncRedis()
+
+# Consumes the presented refresh token and registers its successor in one
+# step. A token that is not the family's current one has already been used,
+# so the family is dropped.
+_ROTATE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    return 0
+end
+if current ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return -1
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+class Rotation(Enum):
+    ROTATED = 1
+    UNKNOWN_FAMILY = 0
+    REUSED = -1
+
+
+def _family_key(family_id: str) -> str:
+    return f"rt_family:{family_id}"
+
+
+_rotate = redis_client.register_script(_ROTATE_SCRIPT)
+
+
+async def start_family(family_id: str, token_id: str, ttl: int):
+    """Register the first refresh token of a new family.
+
+    A family is the chain of refresh tokens descending from one
+    authorization. Its record is just the jti of the only token that may
+    still be used, and it expires together with that token.
+    """
+    await redis_client.set(_family_key(family_id), token_id, ex=ttl)
+
+
+async def rotate_family(family_id: str, token_id: str, next_token_id: str, ttl: int) -> Rotation:
+    result = await _rotate(
+        keys=[_family_key(family_id)], args=[token_id, next_token_id, ttl]
+    )
+    return Rotation(int(result))
+
+
+async def current_token(family_id: str) -> str | None:
+    """The jti of the family's only redeemable refresh token, if it is alive."""
+    return await redis_client.get(_family_key(family_id))
+
+
+async def end_family(family_id: str):
+    await redis_client.delete(_family_key(family_id))
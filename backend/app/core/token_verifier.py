@@ -0,0 +1,127 @@
+import hashlib
+import os
+import time
+
+import jwt
+
+from app.core.jwt_keys import key_ring
+from app.core.revocation import revocation_list
+from app.core.scope_registry import scope_registry
+from app.core.token_families import current_token, end_family
+from app.core.metrics import register_stats
+from app.core.ttl_cache import TTLCache
+
+JWT_ISSUER = os.getenv("JWT_ISSUER")
+ACCESS_TOKEN_CACHE_SIZE = int(os.getenv("ACCESS_TOKEN_CACHE_SIZE", "10000"))
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", str(60 * 60)))
+REFRESH_TOKEN_TTL = int(os.getenv("REFRESH_TOKEN_TTL", str(60 * 60 * 24 * 30)))
+
+# Value of the `token_use` claim of each kind of token we sign. Only access
+# tokens are accepted as bearer tokens
+ACCESS_TOKEN_USE = "access"
+REFRESH_TOKEN_USE = "refresh"
+ID_TOKEN_USE = "id"
+
+# Entries live until the token's own exp; the default TTL is never used
+access_token_cache: TTLCache[bytes, dict] = TTLCache(
+    max_size=ACCESS_TOKEN_CACHE_SIZE, default_ttl=0
+)
+register_stats("cache", "access_token", access_token_cache.stats)
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=20).digest()
+
+
+async def verify_access_token(token: str) -> dict | None:
+    """Returns the claims of a valid, unrevoked access token, or None.
+
+    Signature verification runs once per token; afterwards the decoded claims
+    are served from an LRU keyed by a digest of the token until it expires.
+    The revocation check runs on every call, cached or not.
+    The claims carry the granted scopes as `scope_mask` (see ScopeRegistry),
+    computed once per token and again only after the registry reloads.
+    The returned dict is shared between requests and must not be mutated.
+    """
+    digest = _digest(token)
+    claims = access_token_cache.get(digest)
+    if claims is None:
+        try:
+            claims = key_ring.decode(token, issuer=JWT_ISSUER)
+        except jwt.InvalidTokenError:
+            return None
+        # Refresh and ID tokens are signed with the same keys
+        if claims.get("token_use") != ACCESS_TOKEN_USE:
+            return None
+
+        ttl = claims.get("exp", 0) - time.time()
+        if ttl > 0:
+            access_token_cache.set(digest, claims, ttl=ttl)
+
+    if await is_revoked(claims):
+        return None
+
+    if claims.get("scope_generation") != scope_registry.generation:
+        claims["scope_mask"] = scope_registry.mask(claims.get("scope"))
+        claims["scope_generation"] = scope_registry.generation
+    return claims
+
+
+async def verify_refresh_token(token: str) -> dict | None:
+    """Returns the claims of a refresh token that could still be redeemed, or None.
+
+    Besides the signature and revocation checks, the token must be its
+    family's current one: a token already rotated away is no longer valid.
+    Not cached, as refresh tokens are only seen on refresh and introspection.
+    """
+    try:
+        claims = key_ring.decode(token, issuer=JWT_ISSUER)
+    except jwt.InvalidTokenError:
+        return None
+    if claims.get("token_use") != REFRESH_TOKEN_USE:
+        return None
+
+    if await is_revoked(claims):
+        return None
+    if await current_token(claims.get("fid", "")) != claims.get("jti"):
+        return None
+    return claims
+
+
+async def is_revoked(claims: dict) -> bool:
+    if revocation_list.is_stale(claims):
+        return True
+    # Tokens are denylisted individually by jti, or all at once by family id
+    for token_id in (claims.get("jti"), claims.get("fid")):
+        if token_id and await revocation_list.is_revoked(token_id):
+            return True
+    return False
+
+
+async def revoke_token(token: str):
+    """Denylists a token until its exp. Invalid or expired tokens are ignored."""
+    try:
+        claims = key_ring.decode(token, issuer=JWT_ISSUER)
+    except jwt.InvalidTokenError:
+        return
+
+    forget_access_token(token)
+    if claims.get("jti"):
+        await revocation_list.revoke(claims["jti"], int(claims["exp"]))
+    if claims.get("fid"):
+        await revoke_family(claims["fid"])
+
+
+async def revoke_family(family_id: str):
+    """Ends a refresh token family and denylists every token issued from it.
+
+    The family record going away stops its refresh tokens; the family id
+    only needs to stay denylisted as long as its last access token lives.
+    """
+    await end_family(family_id)
+    await revocation_list.revoke(family_id, int(time.time()) + ACCESS_TOKEN_TTL)
+
+
+def forget_access_token(token: str):
+    """Drops a token from the verified cache so it is re-checked on next use."""
+    access_token_cache.pop(_digest(token))
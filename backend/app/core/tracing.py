@@ -0,0 +1,282 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import random
+import re
+import secrets
+from threading import BoundedSemaphore, Lock
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")  # none, memory or file
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+TRACING_FILE_MAX_QUEUE = int(os.getenv("TRACING_FILE_MAX_QUEUE", "1024"))
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start_ns", "duration_ns", "attributes")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str | None, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.duration_ns = 0
+        self.attributes = attributes
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def end(self, end_ns: int | None = None):
+        self.duration_ns = (end_ns or time.time_ns()) - self.start_ns
+        self.trace.add(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_unix_nano": self.start_ns,
+            "duration_ms": self.duration_ns / 1e6,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """The finished spans of one request, exported together at its end."""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self._lock = Lock()
+
+    def add(self, span: Span):
+        # Hashing spans finish on executor threads
+        with self._lock:
+            self.spans.append(span)
+
+
+#####################################
+# Exporters
+#####################################
+
+
+class SpanExporter(ABC):
+    """Receives the spans of every finished trace. Subclass to ship them."""
+
+    @abstractmethod
+    def export(self, spans: list[Span]):
+        pass
+
+    def flush(self):
+        """Blocks until every exported span is delivered."""
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps the most recent spans in memory; meant for tests and debugging."""
+
+    def __init__(self, max_spans: int = 10000):
+        self._spans: deque[dict] = deque(maxlen=max_spans)
+
+    def export(self, spans: list[Span]):
+        self._spans.extend(span.to_dict() for span in spans)
+
+    @property
+    def spans(self) -> list[dict]:
+        return list(self._spans)
+
+    def clear(self):
+        self._spans.clear()
+
+
+class FileExporter(SpanExporter):
+    """Appends spans to a file, one JSON object per line.
+
+    `export` is called on the event loop, so the write happens on a single
+    background thread, in the order traces finished. At most `max_queue`
+    traces may wait for it; beyond that traces are dropped and counted in
+    `dropped` rather than letting a slow disk grow the backlog.
+    """
+
+    def __init__(self, path: str, max_queue: int = TRACING_FILE_MAX_QUEUE):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="span-export")
+        self._slots = BoundedSemaphore(max_queue)
+        self.dropped = 0
+
+    def export(self, spans: list[Span]):
+        if not self._slots.acquire(blocking=False):
+            self.dropped += 1
+            return
+        records = [span.to_dict() for span in spans]
+        future = self._executor.submit(self._write, records)
+        future.add_done_callback(lambda _: self._slots.release())
+
+    def _write(self, records: list[dict]):
+        lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def flush(self):
+        # The single writer runs tasks in order: this returns after every earlier write
+        self._executor.submit(lambda: None).result()
+
+
+def _exporter_from_env() -> SpanExporter | None:
+    if TRACING_EXPORTER == "memory":
+        return InMemoryExporter()
+    if TRACING_EXPORTER == "file":
+        return FileExporter(TRACING_FILE)
+    return None
+
+
+_exporter: SpanExporter | None = _exporter_from_env()
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def set_exporter(exporter: SpanExporter | None):
+    """Replaces the exporter; None turns span recording off."""
+    global _exporter
+    _exporter = exporter
+
+
+def get_exporter() -> SpanExporter | None:
+    return _exporter
+
+
+#####################################
+# Spans
+#####################################
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Times the enclosed block as a child of the current span.
+
+    Outside a traced request, or with no exporter, this records nothing.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.set_attribute("error", type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def record_span(parent: Span | None, name: str, start_ns: int, end_ns: int, **attributes):
+    """Adds an already finished span, e.g. for work timed on another thread."""
+    if parent is None:
+        return
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    child.start_ns = start_ns
+    child.end(end_ns)
+
+
+def trace_engine(engine: Engine):
+    """Records a span for every statement run on `engine`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        parent = _current_span.get()
+        if parent is not None and context is not None:
+            context._trace_span = Span(
+                parent.trace, "db.query", parent.span_id, {"db.statement": statement[:500]}
+            )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        child = getattr(context, "_trace_span", None)
+        if child is not None:
+            child.end()
+
+
+#####################################
+# HTTP
+#####################################
+
+
+def _parse_traceparent(headers: list[tuple[bytes, bytes]]) -> tuple[str, str, bool] | None:
+    for name, value in headers:
+        if name == b"traceparent":
+            match = _TRACEPARENT.match(value.decode("latin-1").strip().lower())
+            if match and match.group(1) != "0" * 32:
+                return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+    return None
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening a root span for every HTTP request.
+
+    Continues the caller's W3C `traceparent` when present and returns the
+    trace in `traceparent` and `X-Trace-Id` response headers, whether or
+    not the request was sampled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = _parse_traceparent(scope["headers"])
+        if incoming:
+            trace_id, parent_id, sampled = incoming
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+            sampled = random.random() < TRACING_SAMPLE_RATE
+
+        exporter = _exporter
+        root = None
+        if sampled and exporter is not None:
+            root = Span(Trace(trace_id), scope["method"], parent_id, {"http.path": scope["path"]})
+        span_id = root.span_id if root else secrets.token_hex(8)
+        response_headers = [
+            (b"traceparent", f"00-{trace_id}-{span_id}-{'01' if sampled else '00'}".encode()),
+            (b"x-trace-id", trace_id.encode()),
+        ]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + response_headers
+            await send(message)
+
+        token = _current_span.set(root)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_span.reset(token)
+            if root is not None:
+                route = scope.get("route")
+                root.name = f"{scope['method']} {route.path if route is not None else 'unmatched'}"
+                root.set_attribute("http.status_code", status_code)
+                root.end()
+                exporter.export(root.trace.spans)
@@ -1,15 +1,11 @@
-import os
 from typing import Annotated
 from fastapi import Depends, HTTPException, Request
-import jwt
 
-from app.core.database import SessionDep
-from app.core.redis_instance import RedisSingleton
-from app.models.user import User
-
-SECRET_JWT = os.getenv("SECRET_JWT")
-JWT_ISSUER = os.getenv("JWT_ISSUER")
-redis_client = RedisSingleton().getInstance()
+from app.core.database import AsyncSessionDep
+from app.core.token_verifier import verify_access_token
+from app.core.session_store import load_session
+from app.models.user import User, UserRole
+from app.schemas.user.user import TokenPrincipal, UserSnapshot
 
 
 # =====================
@@ -17,25 +13,19 @@ redis_client = RedisSingleton().getInstance()
 # Uses opaque session ID stored in Redis
 # =====================
 
-def get_current_user_or_none(session: SessionDep, request: Request) -> User | None:
-    try:
-        session_id = request.cookies.get("token") or request.headers.get("X-Token")
-        if not session_id:
-            return None
-
-        # Look up the session in Redis
-        user_id = redis_client.get(f"session:{session_id}")
-        if not user_id:
-            return None
-
-        return session.get(User, str(user_id))
-    except Exception:
+async def get_current_user_or_none(request: Request) -> UserSnapshot | None:
+    # Redis errors propagate (503) rather than making the caller anonymous
+    session_id = request.cookies.get("token") or request.headers.get("X-Token")
+    if not session_id:
         return None
 
+    # The session record carries a snapshot of the user, so no DB lookup
+    return await load_session(session_id)
 
-def get_user_required(
-    user: Annotated[User | None, Depends(get_current_user_or_none)],
-) -> User:
+
+async def get_user_required(
+    user: Annotated[UserSnapshot | None, Depends(get_current_user_or_none)],
+) -> UserSnapshot:
     if not user:
         raise HTTPException(
             status_code=401, detail="Authentication required for API access"
@@ -43,39 +33,36 @@ def get_user_required(
     return user
 
 
+async def get_admin_required(
+    user: Annotated[UserSnapshot, Depends(get_user_required)],
+) -> UserSnapshot:
+    if user.role != UserRole.ADMIN.value:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user
+
+
 # =====================
 # OAuth Access Token
 # Used by Client applications to access protected resources
 # =====================
 
-def get_access_token_data(request: Request) -> dict | None:
-    try:
-        access_token = request.cookies.get("access_token")
-        
-        if not access_token:
-            auth_header = request.headers.get("Authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                access_token = auth_header.replace("Bearer ", "")
-        
-        if not access_token:
-            return None
-
-        token_data = jwt.decode(
-            access_token,
-            key=str(SECRET_JWT),
-            algorithms=["HS256"],
-            issuer=JWT_ISSUER
-        )
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
-    except Exception:
+async def get_access_token_data(request: Request) -> dict | None:
+    access_token = request.cookies.get("access_token")
+
+    if not access_token:
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            access_token = auth_header.replace("Bearer ", "")
+
+    if not access_token:
         return None
-    return token_data
+
+    # Invalid tokens come back as None; Redis errors propagate (503) rather
+    # than turning a valid token into a 401
+    return await verify_access_token(access_token)
 
 
-def get_access_token_required(
+async def get_access_token_required(
     token_data: Annotated[dict | None, Depends(get_access_token_data)],
 ) -> dict:
     if not token_data:
@@ -87,16 +74,42 @@ def get_access_token_required(
     return token_data
 
 
-def get_user_from_access_token(
-    session: SessionDep,
+async def get_user_from_access_token(
+    session: AsyncSessionDep,
     token_data: Annotated[dict, Depends(get_access_token_required)],
 ) -> User:
     user_id = token_data.get("sub")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     
     return user
+
+
+async def get_token_principal(
+    token_data: Annotated[dict, Depends(get_access_token_required)],
+) -> TokenPrincipal:
+    """The caller as stated by the access token's claims, with no DB lookup.
+
+    For routes that only need the user's id. Whether the user still exists
+    is not checked here: deleting or disabling a user must go through
+    `revocation_list.revoke_user`, whose epoch bump already makes
+    `verify_access_token` reject every token issued before it.
+    """
+    user_id = token_data.get("sub")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    # client_credentials tokens are issued with the client as their subject
+    if user_id == token_data.get("client_id"):
+        raise HTTPException(status_code=403, detail="A user access token is required")
+
+    return TokenPrincipal(
+        id=user_id,
+        client_id=token_data.get("client_id"),
+        scopes=(token_data.get("scope") or "").split(),
+        scope_mask=token_data.get("scope_mask", 0),
+    )
@@ -1,6 +1,6 @@
 from fastapi import Depends
-from sqlmodel import Session
-from app.core.database import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_async_session
 from app.repositories.oauth_client.ioauth_client_repository import (
     IOAuthClientRepository,
 )
@@ -10,7 +10,7 @@ from app.services.oauth_client.oauth_client_service import OAuthClientService
 
 
 def get_oauth_client_repository(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> IOAuthClientRepository:
     return OAuthClientRepository(session=session)
 
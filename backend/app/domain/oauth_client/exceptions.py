@@ -8,3 +8,7 @@ class InvalidRedirectURI(DomainError):
 
 class GrantTypeNotAllowed(DomainError):
     pass
+
+
+class InvalidScope(DomainError):
+    pass
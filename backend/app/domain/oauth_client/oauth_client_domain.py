@@ -3,8 +3,8 @@ import secrets
 import time
 import uuid
 
-from app.models.user import User
-from app.schemas.dcr.dcr import ClientMetadataRegister
+from app.schemas.user.user import UserSnapshot
+from app.schemas.dcr.dcr import ClientImportRecord, ClientMetadataRegister
 
 
 @dataclass
@@ -19,10 +19,12 @@ class OAuthClientDomain:
     registration_access_token: str | None = None
     software_id: str | None = None
     is_active: bool = True
+    # Scopes the client may request; None allows every registered scope
+    scopes: list[str] | None = None
 
     @classmethod
     def create_new(
-        cls, payload: ClientMetadataRegister, current_user: User
+        cls, payload: ClientMetadataRegister, current_user: UserSnapshot
     ) -> "OAuthClientDomain":
         return cls(
             client_id=str(uuid.uuid4()),
@@ -35,4 +37,21 @@ class OAuthClientDomain:
             registration_access_token=secrets.token_urlsafe(32),
             software_id=str(uuid.uuid4()),
             is_active=True,
+            scopes=(payload.scope or "").split() or None,
+        )
+
+    @classmethod
+    def create_imported(cls, record: ClientImportRecord, owner_id: str) -> "OAuthClientDomain":
+        return cls(
+            client_id=record.client_id or str(uuid.uuid4()),
+            client_secret=record.client_secret or secrets.token_urlsafe(32),
+            redirect_uris=record.redirect_uris,
+            user_id=owner_id,
+            grant_types=list(record.grant_types),
+            client_name=record.client_name,
+            issued_at=int(time.time()),
+            registration_access_token=secrets.token_urlsafe(32),
+            software_id=str(uuid.uuid4()),
+            is_active=True,
+            scopes=(record.scope or "").split() or None,
         )
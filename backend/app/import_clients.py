@@ -0,0 +1,85 @@
+"""Bulk client import.
+
+Registers the clients in an NDJSON file, one ClientImportRecord per line,
+the same way POST /dcr/import does but in-process:
+
+    python -m app.import_clients clients.ndjson --owner-id USER_ID > results.ndjson
+    python -m app.import_clients - --owner-id USER_ID < clients.ndjson
+
+One result per line is written to stdout (or --output) as NDJSON, including
+the plain secrets of created clients, so keep that file safe. A summary goes
+to stderr; the exit status is 1 if any line failed.
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+from typing import AsyncIterator, TextIO
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+async def _read_lines(source: TextIO) -> AsyncIterator[str]:
+    for line in source:
+        yield line
+
+
+async def run_import(source: TextIO, output: TextIO, owner_id: str) -> dict[str, int]:
+    # Imported here so the app reads its configuration after load_dotenv
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from app.core.database import async_engine
+    from app.core.redis_instance import AsyncRedisSingleton
+    from app.core.scope_registry import scope_registry
+    from app.models.user import User
+    from app.repositories.oauth_client.oauth_client_repository import OAuthClientRepository
+    from app.services.oauth_client.oauth_client_service import OAuthClientService
+
+    counts = {"created": 0, "error": 0}
+    try:
+        # Needed to validate the scopes clients are restricted to
+        await scope_registry.load()
+
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            if await session.get(User, owner_id) is None:
+                raise SystemExit(f"Owner {owner_id} does not exist")
+
+            service = OAuthClientService(OAuthClientRepository(session))
+            async for result in service.import_clients(_read_lines(source), owner_id):
+                counts[result["status"]] += 1
+                output.write(json.dumps(result) + "\n")
+    finally:
+        await AsyncRedisSingleton().getInstance().aclose()
+        await async_engine.dispose()
+    return counts
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv(BACKEND_DIR.parent / ".env")
+
+    parser = argparse.ArgumentParser(description="Bulk-import OAuth clients from NDJSON.")
+    parser.add_argument("input", help="NDJSON file, or - for stdin")
+    parser.add_argument("--owner-id", required=True, help="user that will own every imported client")
+    parser.add_argument("--output", type=Path, help="results file (default: stdout)")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        counts = asyncio.run(run_import(source, output, args.owner_id))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{counts['created']} clients created, {counts['error']} failed", file=sys.stderr)
+    sys.exit(1 if counts["error"] else 0)
+
+
+if __name__ == "__main__":
+    main()
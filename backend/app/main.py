@@ -1,23 +1,28 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 import logging
+import os
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from alembic.config import Config
-from alembic import command
+import redis.exceptions
 
 from app.api.handlers import (
     application_error_handler,
     domain_error_handler,
     unexpected_error_handler,
     forbidden_error_handler,
+    redis_unavailable_error_handler,
+    service_unavailable_error_handler,
 )
+from app.core.metrics import MetricsMiddleware
 from app.domain.oauth_client.exceptions import DomainError
 from app.services.exceptions import (
     ApplicationError,
     ForbiddenError,
     InternalServerError,
+    ServiceUnavailableError,
 )
 
 log = logging.getLogger("uvicorn")
@@ -25,19 +30,39 @@ log = logging.getLogger("uvicorn")
 
 load_dotenv(Path(__file__).resolve().parent.parent.parent / ".env")
 
-
-def run_migrations():
-    alembic_cfg = Config("alembic.ini")
-    command.upgrade(alembic_cfg, "head")
+# Turn off when `python -m app.migrations` runs as a deploy step, or where
+# the schema is managed separately (e.g. the benchmarks)
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "true").lower() != "false"
 
 
 @asynccontextmanager
 async def lifespan(app_: FastAPI):
     log.info("Starting up...")
-    log.info("Run alembic upgrade head...")
-    run_migrations()
+    if MIGRATE_ON_STARTUP:
+        # Imported here so Alembic is only loaded when it is going to run.
+        # A no-op beyond one query when `python -m app.migrations` already ran
+        from app.migrations import upgrade_to_head
+
+        upgrade_to_head()
+    await key_ring.refresh()
+    await revocation_list.rebuild()
+    await scope_registry.load()
+    background_tasks = [
+        asyncio.create_task(key_ring.run()),
+        asyncio.create_task(revocation_list.run()),
+        asyncio.create_task(scope_registry.run()),
+    ]
     yield
     log.info("Shutting down...")
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    exporter = get_exporter()
+    if exporter is not None:
+        await asyncio.to_thread(exporter.flush)
+    await AsyncRedisSingleton().getInstance().aclose()
+    await async_engine.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -49,17 +74,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Trace-Id", "traceparent"],
 )
 
-from app.api.routes import dcr, authentication, auth_code_grant, user, project
+from app.core.database import async_engine
+from app.core.jwt_keys import key_ring
+from app.core.redis_instance import AsyncRedisSingleton
+from app.core.revocation import revocation_list
+from app.core.scope_registry import scope_registry
+from app.core.tracing import TracingMiddleware, get_exporter
+from app.api.routes import dcr, authentication, auth_code_grant, user, project, metrics, scope
+
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 app.include_router(dcr.router)
 app.include_router(authentication.router)
 app.include_router(auth_code_grant.router)
 app.include_router(user.router)
 app.include_router(project.router)
+app.include_router(metrics.router)
+app.include_router(scope.router)
 
 app.add_exception_handler(DomainError, domain_error_handler)
 app.add_exception_handler(ApplicationError, application_error_handler)
 app.add_exception_handler(InternalServerError, unexpected_error_handler)
 app.add_exception_handler(ForbiddenError, forbidden_error_handler)
+app.add_exception_handler(ServiceUnavailableError, service_unavailable_error_handler)
+# Redis unreachable, or no pooled connection freed up within REDIS_POOL_TIMEOUT
+app.add_exception_handler(redis.exceptions.ConnectionError, redis_unavailable_error_handler)
+app.add_exception_handler(redis.exceptions.TimeoutError, redis_unavailable_error_handler)
@@ -0,0 +1,131 @@
+"""Database migration runner.
+
+Run once per deployment, before the workers start:
+
+    python -m app.migrations           # upgrade to head if needed
+    python -m app.migrations --check   # exit 1 unless already at head
+
+Workers may also call `upgrade_to_head` on startup (MIGRATE_ON_STARTUP):
+when the database is already at head that costs one query, and otherwise a
+Postgres advisory lock makes sure only one process runs Alembic while the
+others wait and then find nothing left to do.
+"""
+
+import argparse
+import logging
+import os
+from pathlib import Path
+import sys
+from urllib.parse import quote_plus
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+
+log = logging.getLogger("uvicorn")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Arbitrary application-wide key for pg_advisory_lock ("oauth" in ASCII)
+MIGRATION_LOCK_ID = 0x6F61757468
+
+
+def database_url() -> str:
+    """The URL Alembic migrates, built from the POSTGRES_* variables."""
+    postgres_user = os.getenv("POSTGRES_USER", "postgres")
+    postgres_password = os.getenv("POSTGRES_PASSWORD", "")
+    postgres_db = os.getenv("POSTGRES_DB", "postgres")
+    postgres_host = os.getenv("POSTGRES_HOST", "localhost")
+    postgres_port = os.getenv("POSTGRES_PORT", "5432")
+
+    # URL encode the password to handle special characters
+    encoded_password = quote_plus(postgres_password)
+
+    return f"postgresql+psycopg2://{postgres_user}:{encoded_password}@{postgres_host}:{postgres_port}/{postgres_db}"
+
+
+def _alembic_config() -> Config:
+    return Config(str(BACKEND_DIR / "alembic.ini"))
+
+
+def _is_at_head(connection: Connection, heads: set[str]) -> bool:
+    current = set(MigrationContext.configure(connection).get_current_heads())
+    return current == heads
+
+
+def upgrade_to_head(url: str | None = None) -> bool:
+    """Upgrade the database to head unless it is already there.
+
+    Returns True if migrations were run by this process.
+    """
+    config = _alembic_config()
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    engine = create_engine(url or database_url(), poolclass=NullPool)
+
+    try:
+        with engine.connect() as connection:
+            if _is_at_head(connection, heads):
+                connection.rollback()
+                return False
+
+            use_lock = connection.dialect.name == "postgresql"
+            if use_lock:
+                connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+                connection.commit()
+
+            try:
+                # Whoever held the lock before us may already have migrated
+                if _is_at_head(connection, heads):
+                    connection.rollback()
+                    return False
+
+                log.info("Run alembic upgrade head...")
+                config.attributes["connection"] = connection
+                command.upgrade(config, "head")
+                connection.commit()
+                return True
+            finally:
+                if use_lock:
+                    connection.rollback()
+                    connection.execute(
+                        text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID}
+                    )
+                    connection.commit()
+    finally:
+        engine.dispose()
+
+
+def is_at_head(url: str | None = None) -> bool:
+    heads = set(ScriptDirectory.from_config(_alembic_config()).get_heads())
+    engine = create_engine(url or database_url(), poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            return _is_at_head(connection, heads)
+    finally:
+        engine.dispose()
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv(BACKEND_DIR.parent / ".env")
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Apply database migrations.")
+    parser.add_argument("--check", action="store_true", help="only report whether the database is at head")
+    args = parser.parse_args()
+
+    if args.check:
+        at_head = is_at_head()
+        print("Database is at head" if at_head else "Database needs migrating")
+        sys.exit(0 if at_head else 1)
+
+    migrated = upgrade_to_head()
+    print("Database migrated to head" if migrated else "Database already at head")
+
+
+if __name__ == "__main__":
+    main()
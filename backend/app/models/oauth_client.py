@@ -2,7 +2,8 @@ from typing import ClassVar
 from sqlalchemy import JSON
 from sqlmodel import Column, Field, SQLModel
 
-from app.core.bcrypt_encrypter import verify_text
+from app.core.bcrypt_encrypter import verify_text_async
+from app.core.secret_cache import secret_cache
 from app.domain.oauth_client.oauth_client_domain import OAuthClientDomain
 
 
@@ -47,5 +48,13 @@ class OAuthClient(SQLModel, table=True):
             is_active=client.is_active,
         )
 
-    def verify_secret(self, plain_secret: str) -> bool:
-        return verify_text(plain_text=plain_secret, hashed_text=self.client_secret)
+    async def verify_secret(self, plain_secret: str) -> bool:
+        if secret_cache.is_verified(self.client_id, plain_secret, self.client_secret):
+            return True
+
+        is_valid = await verify_text_async(
+            plain_text=plain_secret, hashed_text=self.client_secret
+        )
+        if is_valid:
+            secret_cache.remember(self.client_id, plain_secret, self.client_secret)
+        return is_valid
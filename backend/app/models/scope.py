@@ -0,0 +1,22 @@
+import uuid
+
+from sqlmodel import Field, SQLModel
+
+
+class Scope(SQLModel, table=True):
+    __tablename__ = "scope"  # type: ignore
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    name: str = Field(nullable=False, unique=True)
+    description: str | None = Field(default=None)
+    # Position of the scope in scope masks; assigned once and never reused
+    bit: int = Field(nullable=False, unique=True)
+
+
+class ClientScope(SQLModel, table=True):
+    """A scope the client may request. A client with no rows may request any."""
+
+    __tablename__ = "client_scope"  # type: ignore
+
+    client_id: str = Field(foreign_key="oauth_client.client_id", primary_key=True)
+    scope_id: str = Field(foreign_key="scope.id", primary_key=True)
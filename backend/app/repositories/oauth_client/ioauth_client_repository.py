@@ -2,22 +2,38 @@ from abc import ABC, abstractmethod
 
 from app.domain.oauth_client.oauth_client_domain import OAuthClientDomain
 from app.models.oauth_client import OAuthClient
-from app.models.user import User
+from app.schemas.user.user import UserSnapshot
 
 
 class IOAuthClientRepository(ABC):
     @abstractmethod
-    def save(self, client: OAuthClientDomain) -> OAuthClientDomain:
+    async def save(self, client: OAuthClientDomain) -> OAuthClientDomain:
         pass
 
     @abstractmethod
-    def get_by_id(self, client_id: str) -> OAuthClient | None:
+    async def save_many(self, clients: list[OAuthClientDomain]):
         pass
 
     @abstractmethod
-    def update_secret(self, client_id: str, hashed_secret: str):
+    async def existing_client_ids(self, client_ids: list[str]) -> set[str]:
         pass
 
     @abstractmethod
-    def check_user_permission(self, client_id: str, requested_by: User):
+    async def get_by_id(self, client_id: str) -> OAuthClient | None:
+        pass
+
+    @abstractmethod
+    async def update_secret(self, client_id: str, hashed_secret: str):
+        pass
+
+    @abstractmethod
+    async def set_active(self, client_id: str, is_active: bool):
+        pass
+
+    @abstractmethod
+    async def set_scopes(self, client_id: str, scopes: list[str] | None):
+        pass
+
+    @abstractmethod
+    async def check_user_permission(self, client_id: str, requested_by: UserSnapshot):
         pass
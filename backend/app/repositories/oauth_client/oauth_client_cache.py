@@ -0,0 +1,94 @@
+import os
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.metrics import register_stats
+from app.core.redis_instance import LazyAsyncRedis
+from app.core.ttl_cache import TTLCache
+from app.models.oauth_client import OAuthClient
+from app.models.scope import ClientScope, Scope
+
+redis_client = LazyAsyncRedis()
+
+CLIENT_CACHE_TTL = float(os.getenv("CLIENT_CACHE_TTL", "60"))
+CLIENT_CACHE_SIZE = int(os.getenv("CLIENT_CACHE_SIZE", "4096"))
+
+# Version per client id, bumped on every write to its registration
+CLIENT_VERSIONS_KEY = "oauth_clients:versions"
+
+# Entries are (version, value) and only count while the version is current
+client_cache: TTLCache[str, tuple[int, OAuthClient]] = TTLCache(
+    max_size=CLIENT_CACHE_SIZE, default_ttl=CLIENT_CACHE_TTL
+)
+register_stats("cache", "client", client_cache.stats)
+
+# Allowed scopes per client as a scope mask; -1 (every bit set) means any
+client_scope_cache: TTLCache[str, tuple[int, int]] = TTLCache(
+    max_size=CLIENT_CACHE_SIZE, default_ttl=CLIENT_CACHE_TTL
+)
+register_stats("cache", "client_scope", client_scope_cache.stats)
+ANY_SCOPE = -1
+
+
+async def _current_version(client_id: str) -> int:
+    return int(await redis_client.hget(CLIENT_VERSIONS_KEY, client_id) or 0)
+
+
+async def get_client(session: AsyncSession, client_id: str) -> OAuthClient | None:
+    """Read-through lookup of a client registration.
+
+    Every lookup reads the client's version from Redis, so a row changed by
+    any worker (deactivated, secret rotated) is reloaded on the next request
+    everywhere instead of being served until the TTL runs out.
+
+    Returns a detached copy of the row so it can outlive the session it was
+    loaded with. Callers must treat it as read-only; writes go through the
+    repository, which invalidates the entry. Unknown ids are not cached.
+    """
+    # Read before the row: a write after this bumps the version again
+    version = await _current_version(client_id)
+    cached = client_cache.get(client_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    client = await session.get(OAuthClient, client_id, populate_existing=True)
+    if client is None:
+        return None
+
+    snapshot = OAuthClient.model_validate(client)
+    client_cache.set(client_id, (version, snapshot))
+    return snapshot
+
+
+async def get_allowed_scope_mask(session: AsyncSession, client_id: str) -> int:
+    """Read-through lookup of the scopes a client may request, as a mask.
+
+    The mask uses the ScopeRegistry bits, so a request is allowed when
+    `requested & ~allowed == 0`. A client with no `client_scope` rows is
+    unrestricted and gets ANY_SCOPE. Versioned like `get_client`.
+    """
+    version = await _current_version(client_id)
+    cached = client_scope_cache.get(client_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    result = await session.exec(
+        select(Scope.bit)
+        .join(ClientScope, ClientScope.scope_id == Scope.id)
+        .where(ClientScope.client_id == client_id)
+    )
+    mask = 0
+    for bit in result.all():
+        mask |= 1 << bit
+
+    allowed = mask or ANY_SCOPE
+    client_scope_cache.set(client_id, (version, allowed))
+    return allowed
+
+
+async def invalidate_client(client_id: str):
+    """Drop a client from the cache of every worker; call after committing."""
+    await redis_client.hincrby(CLIENT_VERSIONS_KEY, client_id, 1)
+    client_cache.pop(client_id)
+    client_scope_cache.pop(client_id)
@@ -1,31 +1,41 @@
-from sqlalchemy import update
-from sqlmodel import Session, col, select
-from app.core.bcrypt_encrypter import hash_text
+from sqlalchemy import delete, insert, update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.bcrypt_encrypter import hash_many_async, hash_text_async
 from app.domain.oauth_client.oauth_client_domain import OAuthClientDomain
 from app.models.oauth_client import OAuthClient
-from app.models.user import User
+from app.models.scope import ClientScope, Scope
+from app.schemas.user.user import UserSnapshot
 from app.models.user_oauth_client import UserOAuthClientModel
 from app.repositories.oauth_client.ioauth_client_repository import (
     IOAuthClientRepository,
 )
-from app.services.exceptions import ForbiddenError, InternalServerError
+from app.repositories.oauth_client.oauth_client_cache import (
+    get_client,
+    invalidate_client,
+)
+from app.services.exceptions import (
+    ForbiddenError,
+    InternalServerError,
+    ServiceUnavailableError,
+)
 
 
 class OAuthClientRepository(IOAuthClientRepository):
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def save(self, client: OAuthClientDomain) -> OAuthClientDomain:
+    async def save(self, client: OAuthClientDomain) -> OAuthClientDomain:
         try:
             model = OAuthClient.from_domain(client)
 
             plain_client_secret = client.client_secret
             plain_rat = client.registration_access_token
 
-            model.client_secret = hash_text(plain_text=plain_client_secret)
+            model.client_secret = await hash_text_async(plain_text=plain_client_secret)
 
             if plain_rat:
-                model.registration_access_token = hash_text(plain_text=plain_rat)
+                model.registration_access_token = await hash_text_async(plain_text=plain_rat)
 
             self.session.add(model)
 
@@ -33,45 +43,148 @@ class OAuthClientRepository(IOAuthClientRepository):
                 client_id=model.client_id, user_id=client.user_id
             )
             self.session.add(link)
+            await self._add_scopes(model.client_id, client.scopes)
 
-            self.session.commit()
-            self.session.refresh(model)
-            self.session.refresh(link)
+            await self.session.commit()
+            await self.session.refresh(model)
+            await self.session.refresh(link)
+            await invalidate_client(model.client_id)
 
             result_domain = model.to_domain(user_id=client.user_id)
             result_domain.client_secret = plain_client_secret
             result_domain.registration_access_token = plain_rat
+            result_domain.scopes = client.scopes
+        except ServiceUnavailableError:
+            raise
         except Exception as e:
             print(e)
             raise InternalServerError("Internal server error")
         return result_domain
 
-    def get_by_id(self, client_id: str) -> OAuthClient | None:
+    async def save_many(self, clients: list[OAuthClientDomain]):
+        """Insert a batch of new clients in one transaction.
+
+        Secrets and registration access tokens are hashed in parallel on the
+        bulk hashing pool; clients, owner links and allowed scopes are then
+        written with one multi-row INSERT per table. The domain objects keep
+        their plain secrets.
+        """
+        if not clients:
+            return
+        try:
+            hashed = await hash_many_async(
+                [
+                    text
+                    for client in clients
+                    for text in (client.client_secret, client.registration_access_token)
+                ]
+            )
+
+            client_rows = []
+            for i, client in enumerate(clients):
+                model = OAuthClient.from_domain(client)
+                model.client_secret = hashed[2 * i]
+                model.registration_access_token = hashed[2 * i + 1]
+                client_rows.append(model.model_dump())
+
+            link_rows = [
+                {"client_id": client.client_id, "user_id": client.user_id, "role": "admin"}
+                for client in clients
+            ]
+
+            scope_names = {scope for client in clients for scope in client.scopes or []}
+            scope_ids = {}
+            if scope_names:
+                result = await self.session.exec(
+                    select(Scope.name, Scope.id).where(col(Scope.name).in_(scope_names))
+                )
+                scope_ids = dict(result.all())
+            scope_rows = [
+                {"client_id": client.client_id, "scope_id": scope_ids[scope]}
+                for client in clients
+                for scope in client.scopes or []
+                if scope in scope_ids
+            ]
+
+            await self.session.exec(insert(OAuthClient).values(client_rows))
+            await self.session.exec(insert(UserOAuthClientModel).values(link_rows))
+            if scope_rows:
+                await self.session.exec(insert(ClientScope).values(scope_rows))
+            await self.session.commit()
+        except ServiceUnavailableError:
+            await self.session.rollback()
+            raise
+        except Exception as e:
+            print(e)
+            await self.session.rollback()
+            raise InternalServerError("Internal server error")
+
+    async def existing_client_ids(self, client_ids: list[str]) -> set[str]:
+        if not client_ids:
+            return set()
+        result = await self.session.exec(
+            select(OAuthClient.client_id).where(col(OAuthClient.client_id).in_(client_ids))
+        )
+        return set(result.all())
+
+    async def get_by_id(self, client_id: str) -> OAuthClient | None:
         try:
-            return self.session.get(OAuthClient, client_id)
+            return await get_client(self.session, client_id)
         except Exception as e:
             print(e)
             raise InternalServerError("Internal server error")
 
-    def update_secret(self, client_id: str, hashed_secret: str):
+    async def update_secret(self, client_id: str, hashed_secret: str):
         try:
             stmt = (
                 update(OAuthClient)
                 .filter_by(client_id=client_id)
                 .values(client_secret=hashed_secret)
             )
-            self.session.exec(stmt)
-            self.session.commit()
+            await self.session.exec(stmt)
+            await self.session.commit()
+            await invalidate_client(client_id)
         except Exception as e:
             print(e)
             raise InternalServerError("Internal server error")
 
-    def check_user_permission(self, client_id: str, requested_by: User):
+    async def set_active(self, client_id: str, is_active: bool):
+        try:
+            stmt = (
+                update(OAuthClient)
+                .filter_by(client_id=client_id)
+                .values(is_active=is_active)
+            )
+            await self.session.exec(stmt)
+            await self.session.commit()
+            await invalidate_client(client_id)
+        except Exception as e:
+            print(e)
+            raise InternalServerError("Internal server error")
+
+    async def set_scopes(self, client_id: str, scopes: list[str] | None):
+        try:
+            await self.session.exec(delete(ClientScope).filter_by(client_id=client_id))
+            await self._add_scopes(client_id, scopes)
+            await self.session.commit()
+            await invalidate_client(client_id)
+        except Exception as e:
+            print(e)
+            raise InternalServerError("Internal server error")
+
+    async def _add_scopes(self, client_id: str, scopes: list[str] | None):
+        if not scopes:
+            return
+        result = await self.session.exec(select(Scope.id).where(col(Scope.name).in_(scopes)))
+        for scope_id in result.all():
+            self.session.add(ClientScope(client_id=client_id, scope_id=scope_id))
+
+    async def check_user_permission(self, client_id: str, requested_by: UserSnapshot):
         stmt = select(UserOAuthClientModel).where(
             col(UserOAuthClientModel.client_id) == client_id,
             col(UserOAuthClientModel.user_id) == requested_by.id,
         )
 
-        result = self.session.exec(stmt).first()
+        result = (await self.session.exec(stmt)).first()
         if result is None:
             raise ForbiddenError("User cannot access the client.")
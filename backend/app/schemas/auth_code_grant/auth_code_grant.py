@@ -81,9 +81,10 @@ class RefreshTokenRequest(BaseModel):
 
 class TokenRequest(BaseModel):
     """
-    Unified token request that handles both grant types on /token:
+    Unified token request that handles every grant type on /token:
     - grant_type=authorization_code: requires code, redirect_uri, client_id
     - grant_type=refresh_token: requires refresh_token, optionally scope
+    - grant_type=client_credentials: Basic client auth, optionally scope
     """
     grant_type: str | None = None
     # For authorization_code grant
@@ -94,4 +95,15 @@ class TokenRequest(BaseModel):
     code_verifier: str | None = None
     # For refresh_token grant
     refresh_token: str | None = None
+    # For refresh_token and client_credentials grants
     scope: str | None = None
+
+
+class IntrospectionRequest(BaseModel):
+    """
+    RFC 7662 token introspection request.
+    Send either a single `token` or a batch in `tokens`.
+    """
+    token: str | None = None
+    token_type_hint: str | None = None
+    tokens: list[str] | None = None
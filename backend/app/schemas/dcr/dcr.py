@@ -54,6 +54,24 @@ class ClientMetadataRegister(BaseModel):
     redirect_uris: list[str]
     grant_types: list[str]
     token_endpoint_auth_method: list[TokenEndpointAuthMethod]
+    # RFC 7591 space-separated scopes the client may request; omit for any
+    scope: str | None = None
+
+
+class ClientScopeUpdate(BaseModel):
+    scope: str | None = None
+
+
+class ClientImportRecord(BaseModel):
+    """One line of a bulk import. Existing clients keep their id and secret
+    by passing them; otherwise both are generated as on registration."""
+
+    client_id: str | None = None
+    client_secret: str | None = None
+    client_name: str | None = None
+    redirect_uris: list[str]
+    grant_types: list[str]
+    scope: str | None = None
 
 
 class ClientMetadataResponse(BaseModel):
@@ -62,3 +80,4 @@ class ClientMetadataResponse(BaseModel):
     issued_at: int
     client_name: str | None
     redirect_uris: list[str]
+    scope: str | None = None
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+
+class ScopeRegister(BaseModel):
+    # RFC 6749 section 3.3 scope-token: printable ASCII without space, " or \
+    name: str = Field(pattern=r"^[\x21\x23-\x5B\x5D-\x7E]+$", max_length=64)
+    description: str | None = None
+
+
+class ScopeRead(BaseModel):
+    name: str
+    description: str | None = None
@@ -13,3 +13,24 @@ class UserRegistration(BaseModel):
 class UserLogin(BaseModel):
     email: str
     password: str
+
+
+class UserRoleUpdate(BaseModel):
+    role: UserRole
+
+
+class UserSnapshot(BaseModel):
+    """Principal rebuilt from the session record, without touching Postgres."""
+
+    id: str
+    email: str
+    role: str
+
+
+class TokenPrincipal(BaseModel):
+    """Principal read from a verified access token, without touching Postgres."""
+
+    id: str
+    client_id: str | None = None
+    scopes: list[str] = []
+    scope_mask: int = 0
@@ -10,6 +10,10 @@ class ClientNotFound(ApplicationError):
     pass
 
 
+class ScopeAlreadyExists(ApplicationError):
+    pass
+
+
 class InternalServerError(Exception):
     pass
 
@@ -18,3 +22,11 @@ class ForbiddenError(ApplicationError):
     def __init__(self, detail: str = "Forbidden"):
         self.detail = detail
         super().__init__(detail)
+
+
+class ServiceUnavailableError(Exception):
+    pass
+
+
+class HashingPoolSaturated(ServiceUnavailableError):
+    pass
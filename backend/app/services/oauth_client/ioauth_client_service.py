@@ -1,14 +1,31 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 from app.domain.oauth_client.oauth_client_domain import OAuthClientDomain
-from app.models.user import User
+from app.schemas.user.user import UserSnapshot
 
 
 class IOAuthClientService(ABC):
     @abstractmethod
-    def register_client(self, client: OAuthClientDomain) -> OAuthClientDomain:
+    async def register_client(self, client: OAuthClientDomain) -> OAuthClientDomain:
         pass
 
     @abstractmethod
-    def rotate_secret(self, client_id: str, requested_by: User) -> str:
+    def import_clients(
+        self, lines: AsyncIterator[str], owner_id: str
+    ) -> AsyncIterator[dict]:
+        pass
+
+    @abstractmethod
+    async def rotate_secret(self, client_id: str, requested_by: UserSnapshot) -> str:
+        pass
+
+    @abstractmethod
+    async def deactivate_client(self, client_id: str, requested_by: UserSnapshot):
+        pass
+
+    @abstractmethod
+    async def update_scopes(
+        self, client_id: str, scopes: list[str] | None, requested_by: UserSnapshot
+    ):
         pass
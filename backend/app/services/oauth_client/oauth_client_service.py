@@ -1,44 +1,184 @@
+import os
 import secrets
+from typing import AsyncIterator
 from urllib.parse import urlparse
 
 from fastapi import HTTPException
-from app.core.bcrypt_encrypter import hash_text
-from app.domain.oauth_client.exceptions import InvalidRedirectURI
+from pydantic import ValidationError
+from app.core.bcrypt_encrypter import hash_text_async
+from app.core.revocation import revocation_list
+from app.core.scope_registry import scope_registry
+from app.core.secret_cache import secret_cache
+from app.domain.oauth_client.exceptions import DomainError, InvalidRedirectURI, InvalidScope
 from app.domain.oauth_client.oauth_client_domain import OAuthClientDomain
 from app.models.oauth_client import OAuthClient
-from app.models.user import User
+from app.schemas.dcr.dcr import ClientImportRecord
+from app.schemas.user.user import UserSnapshot
 from app.repositories.oauth_client.ioauth_client_repository import (
     IOAuthClientRepository,
 )
-from app.services.exceptions import ClientNotFound
+from app.services.exceptions import (
+    ClientAlreadyExists,
+    ClientNotFound,
+    InternalServerError,
+    ServiceUnavailableError,
+)
 from app.services.oauth_client.ioauth_client_service import IOAuthClientService
 
+# Clients hashed and inserted per transaction during a bulk import
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "500"))
+
+
+def _describe(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        error = e.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        return f"{location}: {error['msg']}" if location else error["msg"]
+    return str(e)
+
 
 class OAuthClientService(IOAuthClientService):
     def __init__(self, client_repository: IOAuthClientRepository):
         super().__init__()
         self.client_repository = client_repository
 
-    def register_client(self, client: OAuthClientDomain) -> OAuthClientDomain:
+    async def register_client(self, client: OAuthClientDomain) -> OAuthClientDomain:
         self._validate_metadata(client)
-        return self.client_repository.save(client=client)
+        return await self.client_repository.save(client=client)
+
+    async def import_clients(
+        self, lines: AsyncIterator[str], owner_id: str
+    ) -> AsyncIterator[dict]:
+        """Register clients from NDJSON lines, yielding one result per line.
+
+        Lines are handled in chunks of BULK_IMPORT_CHUNK_SIZE, each hashed in
+        parallel and committed in one transaction. A line that fails
+        validation or reuses an existing client_id is reported and skipped;
+        if a chunk fails to commit, all of its lines are reported as failed
+        and the import carries on with the next chunk. Created clients are
+        returned with their plain secret and registration access token,
+        which are not stored anywhere.
+        """
+        chunk: list[tuple[int, str]] = []
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            chunk.append((line_number, line))
+            if len(chunk) >= BULK_IMPORT_CHUNK_SIZE:
+                for result in await self._import_chunk(chunk, owner_id):
+                    yield result
+                chunk = []
+
+        if chunk:
+            for result in await self._import_chunk(chunk, owner_id):
+                yield result
 
-    def rotate_secret(self, client_id: str, requested_by: User) -> str:
-        client = self.client_repository.get_by_id(client_id)
+    async def _import_chunk(self, chunk: list[tuple[int, str]], owner_id: str) -> list[dict]:
+        results: dict[int, dict] = {}
+        clients: dict[int, OAuthClientDomain] = {}
+
+        for line_number, line in chunk:
+            try:
+                record = ClientImportRecord.model_validate_json(line)
+                client = OAuthClientDomain.create_imported(record, owner_id)
+                self._validate_metadata(client)
+            except (ValidationError, DomainError) as e:
+                results[line_number] = {
+                    "line": line_number,
+                    "status": "error",
+                    "error": e.__class__.__name__,
+                    "detail": _describe(e),
+                }
+                continue
+            clients[line_number] = client
+
+        existing = await self.client_repository.existing_client_ids(
+            [client.client_id for client in clients.values()]
+        )
+        seen: set[str] = set()
+        for line_number, client in list(clients.items()):
+            if client.client_id in existing or client.client_id in seen:
+                del clients[line_number]
+                results[line_number] = {
+                    "line": line_number,
+                    "status": "error",
+                    "error": ClientAlreadyExists.__name__,
+                    "detail": f"Client {client.client_id} already exists",
+                }
+            seen.add(client.client_id)
+
+        try:
+            await self.client_repository.save_many(list(clients.values()))
+            for line_number, client in clients.items():
+                results[line_number] = {
+                    "line": line_number,
+                    "status": "created",
+                    "client_id": client.client_id,
+                    "client_secret": client.client_secret,
+                    "registration_access_token": client.registration_access_token,
+                }
+        except (InternalServerError, ServiceUnavailableError) as e:
+            for line_number in clients:
+                results[line_number] = {
+                    "line": line_number,
+                    "status": "error",
+                    "error": e.__class__.__name__,
+                    "detail": "The chunk containing this client could not be saved",
+                }
+
+        return [results[line_number] for line_number, _ in chunk]
+
+    async def rotate_secret(self, client_id: str, requested_by: UserSnapshot) -> str:
+        client = await self.client_repository.get_by_id(client_id)
 
         if client is None:
             raise ClientNotFound("Client not found")
 
-        self.client_repository.check_user_permission(client.client_id, requested_by)
+        await self.client_repository.check_user_permission(client.client_id, requested_by)
 
         new_secret = secrets.token_urlsafe(32)
-        hashed = hash_text(new_secret)
+        hashed = await hash_text_async(new_secret)
 
-        self.client_repository.update_secret(client_id, hashed)
+        await self.client_repository.update_secret(client_id, hashed)
+        secret_cache.invalidate(client_id)
 
         return new_secret
 
+    async def deactivate_client(self, client_id: str, requested_by: UserSnapshot):
+        client = await self.client_repository.get_by_id(client_id)
+
+        if client is None:
+            raise ClientNotFound("Client not found")
+
+        await self.client_repository.check_user_permission(client.client_id, requested_by)
+
+        await self.client_repository.set_active(client_id, False)
+        secret_cache.invalidate(client_id)
+        await revocation_list.revoke_client(client_id)
+
+    async def update_scopes(
+        self, client_id: str, scopes: list[str] | None, requested_by: UserSnapshot
+    ):
+        client = await self.client_repository.get_by_id(client_id)
+
+        if client is None:
+            raise ClientNotFound("Client not found")
+
+        await self.client_repository.check_user_permission(client.client_id, requested_by)
+
+        self._validate_scopes(scopes)
+        await self.client_repository.set_scopes(client_id, scopes)
+
+    def _validate_scopes(self, scopes: list[str] | None):
+        for scope in scopes or []:
+            if not scope_registry.bit(scope):
+                raise InvalidScope(f"Unknown scope: {scope}")
+
     def _validate_metadata(self, client: OAuthClientDomain):
+        self._validate_scopes(client.scopes)
+
         if not client.redirect_uris:
             raise InvalidRedirectURI("At least one redirect_uri is required")
 
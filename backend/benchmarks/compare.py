@@ -0,0 +1,69 @@
+"""Compare two benchmark results files.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Prints the change in throughput and latency percentiles per series and
+exits with status 1 if any p95 got slower, or any throughput dropped, by
+more than --threshold percent.
+"""
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def compare_series(baseline: dict, candidate: dict, threshold: float) -> list[dict]:
+    """Row per series present in both results, with a `regressed` flag."""
+    rows = []
+    for label in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[label], candidate[label]
+        changes = {metric: _change(old[metric], new[metric]) for metric in METRICS}
+        regressed = changes["p95_ms"] > threshold or changes["throughput_rps"] < -threshold
+        rows.append({"label": label, "old": old, "new": new, "change": changes, "regressed": regressed})
+    return rows
+
+
+def print_rows(rows: list[dict]):
+    header = f"{'series':36} " + " ".join(f"{metric:>22}" for metric in METRICS)
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        cells = " ".join(
+            f"{row['old'][m]:>8.2f}->{row['new'][m]:>8.2f} {row['change'][m]:>+4.0f}%"
+            for m in METRICS
+        )
+        marker = "  REGRESSED" if row["regressed"] else ""
+        print(f"{row['label']:36} {cells}{marker}")
+
+
+def _series(results: dict) -> dict:
+    return {**results["endpoints"], "total": results["total"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark results files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    print(f"{baseline.get('commit')} -> {candidate.get('commit')}")
+    if baseline.get("config") != candidate.get("config"):
+        print("warning: the two runs used different settings, compare with care")
+
+    rows = compare_series(_series(baseline), _series(candidate), args.threshold)
+    print_rows(rows)
+    sys.exit(1 if any(row["regressed"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
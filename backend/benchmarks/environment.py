@@ -0,0 +1,74 @@
+"""In-process stand-ins for the services the app needs.
+
+`prepare` (or `configure`) must run before anything under `app` is
+imported, as the app reads its configuration at import time. The Redis
+client is only created on first use, so `use_fake_redis` may come later.
+"""
+
+import os
+from pathlib import Path
+import tempfile
+
+# Seeded like the scope migration does, in the same bit order
+SCOPES = ("openid", "profile", "email", "read", "create", "update", "delete")
+
+
+def configure(redis_url: str | None = None, database_url: str | None = None) -> dict:
+    """Set the environment the app reads its configuration from.
+
+    Without `database_url` a throwaway SQLite file is used through aiosqlite.
+    Returns a short description of the backends for the results file.
+    """
+    if database_url is None:
+        path = Path(tempfile.mkdtemp(prefix="bench-")) / "bench.db"
+        database_url = f"sqlite:///{path}"
+
+    os.environ["POSTGRES_URL"] = database_url
+    os.environ.pop("POSTGRES_ASYNC_URL", None)
+    os.environ.setdefault("SECRET_JWT", "benchmark-secret-" + "x" * 32)
+    os.environ.setdefault("JWT_ISSUER", "http://bench")
+    os.environ["MIGRATE_ON_STARTUP"] = "false"
+    if redis_url:
+        os.environ["REDIS_URL"] = redis_url
+
+    return {
+        "redis": redis_url or "fakeredis",
+        "database": database_url.split("@")[-1],
+    }
+
+
+def use_fake_redis():
+    """Send every Redis call of the app to an in-process fakeredis."""
+    import fakeredis
+
+    from app.core.redis_instance import AsyncRedisSingleton
+
+    AsyncRedisSingleton().conn = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+def prepare(redis_url: str | None = None, database_url: str | None = None) -> dict:
+    """Point the app at real services when given, in-process ones otherwise.
+
+    Without `redis_url` every Redis call goes to fakeredis; see `configure`
+    for the database.
+    """
+    backends = configure(redis_url, database_url)
+    if not redis_url:
+        use_fake_redis()
+    return backends
+
+
+async def create_schema():
+    """Create the tables from the models, as the benchmarks skip alembic."""
+    from sqlalchemy import insert
+    from sqlmodel import SQLModel
+
+    import app.main  # noqa: F401 - registers every model on the metadata
+    from app.core.database import async_engine
+    from app.models.scope import Scope
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(
+            insert(Scope), [{"id": name, "name": name, "bit": bit} for bit, name in enumerate(SCOPES)]
+        )
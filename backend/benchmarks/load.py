@@ -0,0 +1,272 @@
+"""End-to-end load benchmark of the OAuth flow.
+
+Drives the real application (`app.main.app`, lifespan included) in process
+through httpx's ASGI transport. Each virtual user signs up and registers a
+client once, then repeatedly runs the full flow:
+
+    login -> authorize -> consent -> token (PKCE) -> /projects CRUD -> refresh
+
+Redis and Postgres are replaced by fakeredis and a temporary SQLite file
+unless --redis-url / --database-url point at real services.
+
+    cd backend
+    uv run --group bench python -m benchmarks.load --concurrency 16 --iterations 20
+    uv run --group bench python -m benchmarks.compare old.json new.json
+"""
+
+import argparse
+import asyncio
+import base64
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+import platform
+import secrets
+import subprocess
+import time
+import urllib.parse
+
+from benchmarks.environment import create_schema, prepare
+from benchmarks.stats import Recorder
+
+REDIRECT_URI = "http://bench.local/callback"
+SCOPES = "openid read create update delete"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _query_param(url: str, name: str) -> str:
+    return urllib.parse.parse_qs(urllib.parse.urlparse(url).query)[name][0]
+
+
+class VirtualUser:
+    def __init__(self, transport, recorder: Recorder, index: int):
+        import httpx
+
+        self.http = httpx.AsyncClient(transport=transport, base_url="http://bench")
+        self.recorder = recorder
+        self.email = f"bench-{index}-{secrets.token_hex(4)}@example.com"
+        self.password = secrets.token_urlsafe(12)
+        self.client_id = ""
+        self.basic_auth = ""
+        self.flows = 0
+
+    async def call(self, label: str, method: str, url: str, expected: int, **kwargs):
+        started = time.perf_counter()
+        response = await self.http.request(method, url, **kwargs)
+        self.recorder.record(label, time.perf_counter() - started, response.status_code == expected)
+        if response.status_code != expected:
+            raise RuntimeError(f"{label} returned {response.status_code}: {response.text[:200]}")
+        return response
+
+    async def setup(self):
+        await self.call(
+            "POST /auth/signup", "POST", "/auth/signup", 200,
+            json={"name": "bench", "email": self.email, "password": self.password},
+        )
+        await self.login()
+        response = await self.call(
+            "POST /dcr/register", "POST", "/dcr/register", 200,
+            json={
+                "client_name": f"bench client {self.email}",
+                "redirect_uris": [REDIRECT_URI],
+                "grant_types": ["authorization_code", "refresh_token"],
+                "token_endpoint_auth_method": ["client_secret_basic"],
+            },
+        )
+        client = response.json()
+        self.client_id = client["client_id"]
+        credentials = f"{client['client_id']}:{client['client_secret']}".encode()
+        self.basic_auth = "Basic " + base64.b64encode(credentials).decode()
+
+    async def login(self):
+        await self.call(
+            "POST /auth/login", "POST", "/auth/login", 200,
+            json={"email": self.email, "password": self.password},
+        )
+
+    async def flow(self):
+        await self.login()
+        # Start every flow from a clean slate so the consent screen is exercised
+        await self.call("DELETE /authorize/grants", "DELETE", "/authorize/grants", 200)
+
+        verifier = secrets.token_urlsafe(48)
+        challenge = base64.urlsafe_b64encode(
+            hashlib.sha256(verifier.encode()).digest()
+        ).rstrip(b"=").decode()
+        state = secrets.token_urlsafe(8)
+
+        response = await self.call(
+            "GET /authorize", "GET", "/authorize", 307,
+            params={
+                "response_type": "code",
+                "client_id": self.client_id,
+                "redirect_uri": REDIRECT_URI,
+                "scope": SCOPES.split(),
+                "state": state,
+                "code_challenge": challenge,
+                "code_challenge_method": "S256",
+            },
+        )
+        consent_id = _query_param(response.headers["location"], "consent_id")
+
+        await self.call(
+            "GET /authorize/consent-data", "GET", "/authorize/consent-data", 200,
+            params={"consent_id": consent_id},
+        )
+        response = await self.call(
+            "POST /authorize/consent", "POST", "/authorize/consent", 200,
+            json={"consent_id": consent_id, "approved": True},
+        )
+        code = _query_param(response.json()["redirect_url"], "code")
+
+        response = await self.call(
+            "POST /token (authorization_code)", "POST", "/token", 200,
+            json={
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": REDIRECT_URI,
+                "code_verifier": verifier,
+            },
+            headers={"Authorization": self.basic_auth},
+        )
+        tokens = response.json()
+        # Resource calls come from the client application, with a bearer token
+        for cookie in ("access_token", "refresh_token", "id_token"):
+            self.http.cookies.delete(cookie)
+        bearer = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        response = await self.call(
+            "POST /projects", "POST", "/projects/", 201,
+            json={"name": "bench project", "description": "load test"}, headers=bearer,
+        )
+        project_id = response.json()["id"]
+        await self.call("GET /projects", "GET", "/projects/", 200, headers=bearer)
+        await self.call(
+            "PATCH /projects/{id}", "PATCH", f"/projects/{project_id}", 200,
+            json={"name": "renamed"}, headers=bearer,
+        )
+        await self.call(
+            "DELETE /projects/{id}", "DELETE", f"/projects/{project_id}", 200, headers=bearer,
+        )
+
+        await self.call(
+            "POST /token (refresh_token)", "POST", "/token", 200,
+            json={"grant_type": "refresh_token", "refresh_token": tokens["refresh_token"]},
+            headers={"Authorization": self.basic_auth},
+        )
+        for cookie in ("access_token", "refresh_token", "id_token"):
+            self.http.cookies.delete(cookie)
+        self.flows += 1
+
+    async def run(self, iterations: int, deadline: float | None):
+        done = 0
+        while (deadline is None and done < iterations) or (
+            deadline is not None and time.perf_counter() < deadline
+        ):
+            try:
+                await self.flow()
+            except RuntimeError:
+                # Already recorded as an error; start the next flow over
+                pass
+            done += 1
+
+    async def close(self):
+        await self.http.aclose()
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    backends = prepare(redis_url=args.redis_url, database_url=args.database_url)
+    await create_schema()
+
+    import httpx
+
+    from app.main import app
+
+    recorder = Recorder()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        users = [VirtualUser(transport, recorder, i) for i in range(args.concurrency)]
+
+        recorder.enabled = False
+        await asyncio.gather(*(user.setup() for user in users))
+        await asyncio.gather(*(user.run(args.warmup, None) for user in users))
+
+        recorder.start()
+        for user in users:
+            user.flows = 0
+        deadline = time.perf_counter() + args.duration if args.duration else None
+        await asyncio.gather(*(user.run(args.iterations, deadline) for user in users))
+        recorder.stop()
+
+        await asyncio.gather(*(user.close() for user in users))
+
+    summary = recorder.summary()
+    flows = sum(user.flows for user in users)
+    return {
+        "benchmark": "load",
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "concurrency": args.concurrency,
+            "iterations": None if args.duration else args.iterations,
+            "duration_seconds": args.duration,
+            "warmup": args.warmup,
+            **backends,
+        },
+        "flows": flows,
+        "flows_per_second": flows / summary["elapsed_seconds"],
+        **summary,
+    }
+
+
+def print_summary(results: dict):
+    print(
+        f"{results['flows']} flows in {results['elapsed_seconds']:.2f}s "
+        f"({results['flows_per_second']:.1f} flows/s, concurrency "
+        f"{results['config']['concurrency']})"
+    )
+    header = f"{'endpoint':36} {'count':>6} {'err':>4} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = list(results["endpoints"].items()) + [("total", results["total"])]
+    for label, s in rows:
+        print(
+            f"{label:36} {s['count']:>6} {s['errors']:>4} {s['throughput_rps']:>8.1f} "
+            f"{s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=8, help="virtual users")
+    parser.add_argument("--iterations", type=int, default=10, help="flows per virtual user")
+    parser.add_argument("--duration", type=float, help="run for N seconds instead of --iterations")
+    parser.add_argument("--warmup", type=int, default=1, help="unrecorded flows per virtual user")
+    parser.add_argument("--redis-url", help="use this Redis instead of fakeredis")
+    parser.add_argument("--database-url", help="use this database instead of SQLite")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args))
+    print_summary(results)
+
+    output = args.output or RESULTS_DIR / f"load-{results['commit']}-c{args.concurrency}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
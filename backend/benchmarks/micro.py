@@ -0,0 +1,231 @@
+"""Microbenchmarks of the functions on the authentication hot path.
+
+Each function is called in a tight loop; the loop size is calibrated so a
+round takes at least --min-round-time, and the median per-call time over
+--rounds rounds is reported. bcrypt runs at the configured BCRYPT_ROUNDS.
+
+    cd backend
+    uv run --group bench python -m benchmarks.micro --save-baseline
+    # ... change code ...
+    uv run --group bench python -m benchmarks.micro --compare --threshold 25
+
+--compare exits with status 1 if any function's median got slower than the
+baseline by more than --threshold percent.
+"""
+
+import argparse
+import asyncio
+import base64
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+import platform
+import statistics
+import time
+from typing import Any, Callable
+
+from benchmarks.environment import create_schema, prepare
+from benchmarks.load import RESULTS_DIR, _git_commit
+
+DEFAULT_BASELINE = RESULTS_DIR / "micro-baseline.json"
+
+
+class Case:
+    def __init__(self, name: str, fn: Callable[[], Any], is_async: bool = False):
+        self.name = name
+        self.fn = fn
+        self.is_async = is_async
+
+
+async def _time_calls(case: Case, calls: int) -> float:
+    fn = case.fn
+    started = time.perf_counter()
+    if case.is_async:
+        for _ in range(calls):
+            await fn()
+    else:
+        for _ in range(calls):
+            fn()
+    return time.perf_counter() - started
+
+
+async def measure(case: Case, rounds: int, min_round_time: float) -> dict:
+    calls = 1
+    while True:
+        elapsed = await _time_calls(case, calls)
+        if elapsed >= min_round_time:
+            break
+        # Aim straight for the target instead of doubling from one call
+        calls = max(calls * 2, int(calls * min_round_time / max(elapsed, 1e-9) * 1.2))
+
+    per_call = [await _time_calls(case, calls) / calls for _ in range(rounds)]
+    median = statistics.median(per_call)
+    return {
+        "median_us": median * 1e6,
+        "min_us": min(per_call) * 1e6,
+        "mean_us": statistics.fmean(per_call) * 1e6,
+        "ops_per_second": 1 / median if median else 0.0,
+        "calls_per_round": calls,
+        "rounds": rounds,
+    }
+
+
+async def build_cases() -> list[Case]:
+    """Set up the app state the functions need and wrap each in a Case."""
+    await create_schema()
+
+    from starlette.requests import Request
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from app.api.routes.auth_code_grant import (
+        _build_token_response,
+        _generate_tokens,
+        _verify_pkce,
+        extract_client_credentials,
+    )
+    from app.api.routes.project import check_scope
+    from app.core.bcrypt_encrypter import hash_text, verify_text
+    from app.core.database import async_engine
+    from app.core.jwt_keys import key_ring
+    from app.core.revocation import revocation_list
+    from app.core.scope_registry import scope_registry
+    from app.core.token_verifier import access_token_cache
+    from app.dependencies.auth import get_access_token_data
+    from app.models.user import User
+
+    await key_ring.refresh()
+    await revocation_list.rebuild()
+    await scope_registry.load()
+
+    session = AsyncSession(async_engine, expire_on_commit=False)
+    user = User(id="bench-user", email="bench@example.com", password="x")
+    session.add(user)
+    await session.commit()
+
+    scopes = "openid read create update delete"
+    tokens = await _generate_tokens(user.id, "bench-client", scopes, session)
+    headers = {"Cache-Control": "no-store", "Pragma": "no-cache"}
+
+    verifier = "v" * 64
+    challenge = base64.urlsafe_b64encode(
+        hashlib.sha256(verifier.encode()).digest()
+    ).rstrip(b"=").decode()
+    basic = "Basic " + base64.b64encode(b"bench-client:bench-secret").decode()
+
+    request = Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/projects/",
+        "headers": [(b"authorization", f"Bearer {tokens['access_token']}".encode())],
+    })
+
+    async def access_token_data_uncached():
+        access_token_cache.clear()
+        await get_access_token_data(request)
+
+    claims = await get_access_token_data(request)
+    scope_check = check_scope("read")
+    hashed = hash_text("correct horse battery staple")
+
+    return [
+        Case(
+            "_generate_tokens",
+            lambda: _generate_tokens(user.id, "bench-client", scopes, session),
+            is_async=True,
+        ),
+        Case("_build_token_response", lambda: _build_token_response(tokens, headers)),
+        Case("_verify_pkce", lambda: _verify_pkce(verifier, challenge, "S256")),
+        Case("extract_client_credentials", lambda: extract_client_credentials(basic)),
+        Case(
+            "get_access_token_data (cached)",
+            lambda: get_access_token_data(request),
+            is_async=True,
+        ),
+        Case("get_access_token_data (uncached)", access_token_data_uncached, is_async=True),
+        Case("check_scope", lambda: scope_check(claims), is_async=True),
+        Case("hash_text", lambda: hash_text("correct horse battery staple")),
+        Case("verify_text", lambda: verify_text("correct horse battery staple", hashed)),
+    ]
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    prepare()
+    cases = [
+        case for case in await build_cases()
+        if not args.filter or args.filter in case.name
+    ]
+
+    from app.core.bcrypt_encrypter import BCRYPT_ROUNDS
+
+    functions = {}
+    for case in cases:
+        functions[case.name] = await measure(case, args.rounds, args.min_round_time)
+        print(f"{case.name:36} {functions[case.name]['median_us']:>12.2f} us")
+
+    return {
+        "benchmark": "micro",
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {"rounds": args.rounds, "bcrypt_rounds": BCRYPT_ROUNDS},
+        "functions": functions,
+    }
+
+
+def compare(baseline: dict, results: dict, threshold: float, section: str = "functions") -> bool:
+    """Print the change per entry of `section`; True if any regressed past threshold."""
+    print(f"\n{baseline.get('commit')} -> {results.get('commit')}")
+    if baseline.get("config", {}).get("bcrypt_rounds") != results["config"].get("bcrypt_rounds"):
+        print("warning: bcrypt cost differs from the baseline")
+
+    regressed = False
+    for name, current in results[section].items():
+        previous = baseline[section].get(name)
+        if previous is None:
+            print(f"{name:36} (new)")
+            continue
+        change = (current["median_us"] - previous["median_us"]) / previous["median_us"] * 100
+        slow = change > threshold
+        regressed |= slow
+        print(
+            f"{name:36} {previous['median_us']:>12.2f} -> {current['median_us']:>12.2f} us "
+            f"{change:>+6.1f}%{'  REGRESSED' if slow else ''}"
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-round-time", type=float, default=0.05, help="seconds")
+    parser.add_argument("--filter", help="only run functions whose name contains this")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/)")
+    parser.add_argument(
+        "--save-baseline", nargs="?", const=DEFAULT_BASELINE, type=Path,
+        help=f"also store the results as the baseline (default {DEFAULT_BASELINE.name})",
+    )
+    parser.add_argument(
+        "--compare", nargs="?", const=DEFAULT_BASELINE, type=Path,
+        help="compare against a baseline and fail on regressions",
+    )
+    parser.add_argument("--threshold", type=float, default=25.0, help="percent")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args))
+
+    output = args.output or RESULTS_DIR / f"micro-{results['commit']}.json"
+    outputs = [output] + ([args.save_baseline] if args.save_baseline else [])
+    for path in outputs:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {path}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(baseline, results, args.threshold):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
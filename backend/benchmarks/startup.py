@@ -0,0 +1,180 @@
+"""Startup benchmark: cold import and time to first served request.
+
+Every run starts a fresh interpreter, so nothing is cached in-process:
+
+    cd backend
+    uv run --group bench python -m benchmarks.startup --save-baseline
+    # ... change code ...
+    uv run --group bench python -m benchmarks.startup --compare --threshold 25
+
+Reported phases, each as the median over --runs processes:
+
+    import           `import app.main`
+    lifespan         the lifespan's startup half (keys, revocation list)
+    first_request    the first GET /.well-known/jwks.json
+    first_served     from spawning the process to the first response,
+                     interpreter start-up included
+
+The schema is created between import and lifespan and is not counted;
+migrations are off (MIGRATE_ON_STARTUP=false), as in a deployment where
+`python -m app.migrations` runs beforehand. With fakeredis each process
+starts from an empty Redis, i.e. it measures a first boot that generates
+its signing keys; pass --redis-url to measure restarts against a warm one.
+"""
+
+import argparse
+import asyncio
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.load import RESULTS_DIR, _git_commit
+from benchmarks.micro import compare
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = RESULTS_DIR / "startup-baseline.json"
+PHASES = ("import", "lifespan", "first_request", "first_served")
+
+
+async def _child(redis_url: str | None, database_url: str | None) -> dict:
+    from benchmarks.environment import configure, create_schema, use_fake_redis
+
+    configure(redis_url, database_url)
+
+    started = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+
+    import httpx
+
+    if not redis_url:
+        use_fake_redis()
+    await create_schema()
+
+    async with AsyncExitStack() as stack:
+        lifespan_started = time.perf_counter()
+        await stack.enter_async_context(app.router.lifespan_context(app))
+        ready = time.perf_counter()
+
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+        )
+        response = await client.get("/.well-known/jwks.json")
+        served_at = time.time()
+        served = time.perf_counter()
+        response.raise_for_status()
+
+    return {
+        "import": imported - started,
+        "lifespan": ready - lifespan_started,
+        "first_request": served - ready,
+        "served_at": served_at,
+    }
+
+
+def run_once(args: argparse.Namespace) -> dict:
+    command = [sys.executable, "-m", "benchmarks.startup", "--child"]
+    if args.redis_url:
+        command += ["--redis-url", args.redis_url]
+    if args.database_url:
+        command += ["--database-url", args.database_url]
+
+    spawned_at = time.time()
+    completed = subprocess.run(
+        command, cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    # The child's only stdout line is its result; logs go to stderr
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["first_served"] = timings.pop("served_at") - spawned_at
+    return timings
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    # One unrecorded run so the first measured one does not pay for a cold
+    # filesystem cache and bytecode compilation
+    run_once(args)
+
+    samples = {phase: [] for phase in PHASES}
+    for i in range(args.runs):
+        timings = run_once(args)
+        for phase in PHASES:
+            samples[phase].append(timings[phase] * 1e6)
+        print(
+            f"run {i + 1:>2}: "
+            + "  ".join(f"{phase} {timings[phase] * 1e3:.1f} ms" for phase in PHASES)
+        )
+
+    phases = {
+        phase: {
+            "median_us": statistics.median(values),
+            "min_us": min(values),
+            "max_us": max(values),
+        }
+        for phase, values in samples.items()
+    }
+    return {
+        "benchmark": "startup",
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "runs": args.runs,
+            "redis": args.redis_url or "fakeredis",
+            "database": (args.database_url or "sqlite").split("@")[-1],
+        },
+        "phases": phases,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10, help="processes to start")
+    parser.add_argument("--redis-url", help="use this Redis instead of fakeredis")
+    parser.add_argument("--database-url", help="use this database instead of SQLite")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/)")
+    parser.add_argument(
+        "--save-baseline", nargs="?", const=DEFAULT_BASELINE, type=Path,
+        help=f"also store the results as the baseline (default {DEFAULT_BASELINE.name})",
+    )
+    parser.add_argument(
+        "--compare", nargs="?", const=DEFAULT_BASELINE, type=Path,
+        help="compare against a baseline and fail on regressions",
+    )
+    parser.add_argument("--threshold", type=float, default=25.0, help="percent")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        timings = asyncio.run(_child(args.redis_url, args.database_url))
+        print(json.dumps(timings))
+        return
+
+    results = run_benchmark(args)
+    print()
+    for phase, s in results["phases"].items():
+        print(
+            f"{phase:16} median {s['median_us'] / 1e3:>8.1f} ms  "
+            f"min {s['min_us'] / 1e3:>8.1f} ms  max {s['max_us'] / 1e3:>8.1f} ms"
+        )
+
+    output = args.output or RESULTS_DIR / f"startup-{results['commit']}.json"
+    outputs = [output] + ([args.save_baseline] if args.save_baseline else [])
+    for path in outputs:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {path}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(baseline, results, args.threshold, section="phases"):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
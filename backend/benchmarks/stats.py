@@ -0,0 +1,71 @@
+import math
+import time
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """Throughput and latency percentiles (in milliseconds) of one series."""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "count": count,
+        "errors": errors,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+        "mean_ms": sum(values) / count * 1000 if count else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": values[-1] * 1000 if count else 0.0,
+    }
+
+
+class Recorder:
+    """Collects per-endpoint latencies while the load runs."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.enabled = True
+        self._started = time.perf_counter()
+        self._stopped: float | None = None
+
+    def start(self):
+        self.latencies.clear()
+        self.errors.clear()
+        self.enabled = True
+        self._started = time.perf_counter()
+        self._stopped = None
+
+    def stop(self):
+        self._stopped = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return (self._stopped or time.perf_counter()) - self._started
+
+    def record(self, label: str, seconds: float, ok: bool):
+        if not self.enabled:
+            return
+        self.latencies.setdefault(label, []).append(seconds)
+        if not ok:
+            self.errors[label] = self.errors.get(label, 0) + 1
+
+    def summary(self) -> dict:
+        elapsed = self.elapsed
+        endpoints = {
+            label: summarize(values, self.errors.get(label, 0), elapsed)
+            for label, values in sorted(self.latencies.items())
+        }
+        every = [value for values in self.latencies.values() for value in values]
+        return {
+            "elapsed_seconds": elapsed,
+            "total": summarize(every, sum(self.errors.values()), elapsed),
+            "endpoints": endpoints,
+        }
@@ -0,0 +1,94 @@
+"""Shared fixtures for the behaviour tests.
+
+The app runs in-process against the same stand-ins the benchmarks use:
+fakeredis (with Lua, for the scripts) and a throwaway SQLite file. Each
+test gets an empty Redis and a started app; the database is shared, so
+tests create their own users and clients.
+"""
+
+import asyncio
+import base64
+import secrets
+
+from benchmarks.environment import create_schema, prepare, use_fake_redis
+
+# Before anything under app is imported, as it reads its configuration then
+prepare()
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from tests.flows import REDIRECT_URI  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def schema():
+    from app.core.database import async_engine
+
+    async def setup():
+        await create_schema()
+        await async_engine.dispose()
+
+    asyncio.run(setup())
+
+
+@pytest.fixture
+async def redis():
+    """An empty fakeredis behind every Redis call of the app."""
+    from app.core.redis_instance import AsyncRedisSingleton
+
+    use_fake_redis()
+    client = AsyncRedisSingleton().getInstance()
+    await client.flushall()
+    return client
+
+
+@pytest.fixture
+async def app(schema, redis):
+    from app.core.database import async_engine
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        yield app
+    # Pooled connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def oauth_client(client) -> dict:
+    """A logged-in user and a confidential client registered by them.
+
+    Adds `basic` (the client's Basic auth header) to the registration response.
+    """
+    email = f"{secrets.token_hex(8)}@example.test"
+    response = await client.post(
+        "/auth/signup", json={"name": "Test", "email": email, "password": "password"}
+    )
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/dcr/register",
+        json={
+            "client_name": "test",
+            "redirect_uris": [REDIRECT_URI],
+            "grant_types": ["authorization_code", "refresh_token"],
+            "token_endpoint_auth_method": ["client_secret_basic"],
+        },
+    )
+    assert response.status_code == 200, response.text
+    registration = response.json()
+    credentials = f"{registration['client_id']}:{registration['client_secret']}"
+    registration["basic"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+    return registration
@@ -0,0 +1,80 @@
+"""OAuth flows the behaviour tests drive through the HTTP API."""
+
+import base64
+import hashlib
+import secrets
+import urllib.parse
+
+import httpx
+
+REDIRECT_URI = "http://client.test/callback"
+
+
+def _query(url: str) -> dict[str, str]:
+    return {k: v[0] for k, v in urllib.parse.parse_qs(urllib.parse.urlparse(url).query).items()}
+
+
+async def start_authorization(
+    client: httpx.AsyncClient, oauth_client: dict, scope: str
+) -> tuple[dict[str, str], str]:
+    """GET /authorize; returns the query of the redirect and the PKCE verifier.
+
+    The query holds `consent_id` when consent is needed, `code` when it was
+    already given, or `error`.
+    """
+    verifier = secrets.token_urlsafe(48)
+    challenge = (
+        base64.urlsafe_b64encode(hashlib.sha256(verifier.encode()).digest())
+        .rstrip(b"=")
+        .decode()
+    )
+    response = await client.get(
+        "/authorize",
+        params={
+            "response_type": "code",
+            "client_id": oauth_client["client_id"],
+            "redirect_uri": REDIRECT_URI,
+            "scope": scope.split(),
+            "state": "state",
+            "code_challenge": challenge,
+            "code_challenge_method": "S256",
+        },
+    )
+    return _query(response.headers["location"]), verifier
+
+
+async def approve(
+    client: httpx.AsyncClient, consent_id: str, scopes: list[str] | None = None
+) -> dict[str, str]:
+    """POST /authorize/consent; returns the query of the redirect URL."""
+    body = {"consent_id": consent_id, "approved": True}
+    if scopes is not None:
+        body["approved_scopes"] = scopes
+    response = await client.post("/authorize/consent", json=body)
+    return _query(response.json()["redirect_url"])
+
+
+async def exchange_code(
+    client: httpx.AsyncClient, oauth_client: dict, code: str, verifier: str
+) -> httpx.Response:
+    return await client.post(
+        "/token",
+        json={
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": REDIRECT_URI,
+            "code_verifier": verifier,
+        },
+        headers={"Authorization": oauth_client["basic"]},
+    )
+
+
+async def authorize(client: httpx.AsyncClient, oauth_client: dict, scope: str) -> dict:
+    """Run the authorization code flow with consent and return the token response."""
+    query, verifier = await start_authorization(client, oauth_client, scope)
+    if "consent_id" in query:
+        query = await approve(client, query["consent_id"])
+
+    response = await exchange_code(client, oauth_client, query["code"], verifier)
+    assert response.status_code == 200, response.text
+    return response.json()
@@ -0,0 +1,57 @@
+import pytest
+
+from app.core.consent_store import list_consents
+from tests.flows import approve, exchange_code, start_authorization
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def restricted_client(client, oauth_client) -> dict:
+    """The test client, allowed to request `openid read` only."""
+    response = await client.put(
+        f"/dcr/{oauth_client['client_id']}/scope", json={"scope": "openid read"}
+    )
+    assert response.status_code == 200, response.text
+    return oauth_client
+
+
+async def _user_id(client) -> str:
+    return (await client.get("/users/me")).json()["id"]
+
+
+async def test_authorize_rejects_scopes_outside_the_client(client, restricted_client, redis):
+    query, _ = await start_authorization(client, restricted_client, "read delete")
+
+    assert query["error"] == "invalid_scope"
+    assert "consent_id" not in query
+    assert await redis.keys("consent:*") == []
+
+
+async def test_consent_cannot_widen_the_validated_scopes(client, restricted_client):
+    query, _ = await start_authorization(client, restricted_client, "read")
+
+    query = await approve(client, query["consent_id"], ["read", "delete", "create"])
+
+    assert query == {"error": "invalid_scope", "state": "state"}
+    assert await list_consents(await _user_id(client)) == {}
+
+
+async def test_consent_rechecks_the_client_restriction(client, restricted_client):
+    query, _ = await start_authorization(client, restricted_client, "openid read")
+    # Narrowed between /authorize and the consent screen
+    await client.put(f"/dcr/{restricted_client['client_id']}/scope", json={"scope": "openid"})
+
+    query = await approve(client, query["consent_id"])
+
+    assert query["error"] == "invalid_scope"
+
+
+async def test_consent_may_narrow_the_scopes(client, restricted_client):
+    query, verifier = await start_authorization(client, restricted_client, "openid read")
+
+    query = await approve(client, query["consent_id"], ["read"])
+    response = await exchange_code(client, restricted_client, query["code"], verifier)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["scope"] == "read"
@@ -0,0 +1,87 @@
+import base64
+import time
+
+import anyio
+import pytest
+
+from app.core.client_token_cache import (
+    CLIENT_TOKEN_REUSE_MARGIN,
+    get_reusable_token,
+    remember_token,
+)
+from app.core.token_verifier import revoke_token
+from tests.flows import REDIRECT_URI
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def machine_client(client, oauth_client) -> dict:
+    """A confidential client registered for client_credentials."""
+    response = await client.post(
+        "/dcr/register",
+        json={
+            "client_name": "machine",
+            "redirect_uris": [REDIRECT_URI],
+            "grant_types": ["client_credentials"],
+            "token_endpoint_auth_method": ["client_secret_basic"],
+        },
+    )
+    assert response.status_code == 200, response.text
+    registration = response.json()
+    credentials = f"{registration['client_id']}:{registration['client_secret']}"
+    registration["basic"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+    return registration
+
+
+async def _token(client, machine_client, scope: str | None = "read"):
+    body = {"grant_type": "client_credentials", **({"scope": scope} if scope else {})}
+    return await client.post("/token", json=body, headers={"Authorization": machine_client["basic"]})
+
+
+async def test_same_scope_set_reuses_the_token(client, machine_client):
+    first = (await _token(client, machine_client, "read create")).json()
+
+    assert (await _token(client, machine_client, "create read")).json()["access_token"] == first["access_token"]
+    assert (await _token(client, machine_client, "read")).json()["access_token"] != first["access_token"]
+
+
+async def test_tokens_near_expiry_are_not_reused(redis):
+    now = time.time()
+    remember_token("client", ["read"], "almost-expired", {"exp": now + CLIENT_TOKEN_REUSE_MARGIN - 1})
+    remember_token("client", ["create"], "expiring", {"exp": now + CLIENT_TOKEN_REUSE_MARGIN + 0.05})
+    remember_token("client", ["update"], "fresh", {"exp": now + CLIENT_TOKEN_REUSE_MARGIN + 60})
+
+    assert get_reusable_token("client", ["read"]) is None
+    assert get_reusable_token("client", ["create"])[0] == "expiring"
+    assert get_reusable_token("client", ["update"])[0] == "fresh"
+
+    # Dropped once less than the margin is left
+    await anyio.sleep(0.1)
+    assert get_reusable_token("client", ["create"]) is None
+
+
+async def test_revoked_token_is_not_handed_out_again(client, machine_client):
+    first = (await _token(client, machine_client)).json()["access_token"]
+
+    await revoke_token(first)
+
+    second = (await _token(client, machine_client)).json()["access_token"]
+    assert second != first
+    assert (await _token(client, machine_client)).json()["access_token"] == second
+
+
+async def test_deactivated_client_gets_no_token(client, machine_client):
+    first = (await _token(client, machine_client)).json()["access_token"]
+
+    response = await client.post(f"/dcr/{machine_client['client_id']}/deactivate")
+    assert response.status_code == 200, response.text
+
+    response = await _token(client, machine_client)
+    assert response.status_code == 401
+    assert response.json()["error"] == "invalid_client"
+    # The client revocation also ended the token that was cached for reuse
+    response = await client.post(
+        "/token/introspect", json={"token": first}, headers={"Authorization": machine_client["basic"]}
+    )
+    assert response.status_code == 401 or response.json() == {"active": False}
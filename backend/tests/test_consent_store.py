@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from app.core.consent_store import (
+    CONSENT_TTL,
+    grant_consent,
+    has_consent,
+    list_consents,
+    revoke_consents,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_consent_covers_granted_subsets_only(redis):
+    await grant_consent("user", "client", ["openid", "read"])
+
+    assert await has_consent("user", "client", ["read"])
+    assert await has_consent("user", "client", ["openid", "read"])
+    assert await has_consent("user", "client", [])
+    assert not await has_consent("user", "client", ["openid", "read", "delete"])
+    assert not await has_consent("user", "other-client", ["read"])
+
+
+async def test_grant_replaces_the_earlier_grant(redis):
+    await grant_consent("user", "client", ["openid", "read"])
+    await grant_consent("user", "client", ["create"])
+
+    assert await has_consent("user", "client", ["create"])
+    assert not await has_consent("user", "client", ["read"])
+    assert (await list_consents("user"))["client"]["scopes"] == ["create"]
+
+
+async def test_revoke_only_touches_the_given_clients(redis):
+    await grant_consent("user", "a", ["read"])
+    await grant_consent("user", "b", ["read", "update"])
+    # A client id that is a prefix of another must not match it
+    await grant_consent("user", "a-b", ["read"])
+
+    await revoke_consents("user", ["a"])
+
+    assert not await has_consent("user", "a", ["read"])
+    assert await has_consent("user", "b", ["read", "update"])
+    assert await has_consent("user", "a-b", ["read"])
+    assert sorted(await list_consents("user")) == ["a-b", "b"]
+
+    await revoke_consents("user")
+    assert await list_consents("user") == {}
+
+
+async def test_expired_grant_is_ignored(redis):
+    await grant_consent("user", "client", ["read"])
+    await redis.hset("consent_grants:user", "client", int(time.time()) - CONSENT_TTL)
+
+    assert not await has_consent("user", "client", ["read"])
+    assert await list_consents("user") == {}
@@ -0,0 +1,67 @@
+import secrets
+
+import pytest
+from sqlalchemy import update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_engine
+from app.models.oauth_client import OAuthClient
+from app.repositories.oauth_client.oauth_client_cache import (
+    CLIENT_VERSIONS_KEY,
+    client_cache,
+    get_client,
+    invalidate_client,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client_id(schema, redis) -> str:
+    client_id = secrets.token_hex(8)
+    async with AsyncSession(async_engine) as session:
+        session.add(
+            OAuthClient(
+                client_id=client_id,
+                client_secret="hash",
+                redirect_uris=["http://client.test/callback"],
+                grant_types=["authorization_code"],
+                issued_at=0,
+            )
+        )
+        await session.commit()
+    yield client_id
+    await async_engine.dispose()
+
+
+async def _deactivate_elsewhere(client_id: str):
+    """Change the row the way another worker would: its cache is not ours."""
+    async with AsyncSession(async_engine) as session:
+        await session.exec(
+            update(OAuthClient).filter_by(client_id=client_id).values(is_active=False)
+        )
+        await session.commit()
+
+
+async def _load(client_id: str) -> OAuthClient | None:
+    async with AsyncSession(async_engine) as session:
+        return await get_client(session, client_id)
+
+
+async def test_invalidation_on_another_worker_reloads_the_row(redis, client_id):
+    assert (await _load(client_id)).is_active
+
+    await _deactivate_elsewhere(client_id)
+    # The other worker's invalidate_client only clears its own cache locally
+    await redis.hincrby(CLIENT_VERSIONS_KEY, client_id, 1)
+
+    assert not (await _load(client_id)).is_active
+
+
+async def test_invalidate_client_bumps_the_shared_version(redis, client_id):
+    await _load(client_id)
+
+    await invalidate_client(client_id)
+
+    assert await redis.hget(CLIENT_VERSIONS_KEY, client_id) == "1"
+    assert client_cache.get(client_id) is None
@@ -0,0 +1,43 @@
+import asyncio
+
+import fakeredis
+import pytest
+import redis.asyncio
+
+from app.core.redis_instance import AsyncRedisSingleton, _pool_kwargs
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_saturated_pool_queues_instead_of_failing():
+    # The app's pool class and settings, with fewer connections than callers;
+    # fakeredis connections do not answer the health check PING
+    pool = type(AsyncRedisSingleton().pool)(
+        connection_class=fakeredis.aioredis.FakeAsyncRedisConnection,
+        server=fakeredis.FakeServer(),
+        **{**_pool_kwargs(), "max_connections": 5, "health_check_interval": 0},
+    )
+    client = redis.asyncio.Redis(connection_pool=pool)
+    await client.set("key", "value")
+
+    results = await asyncio.gather(*(client.get("key") for _ in range(200)))
+
+    assert results == ["value"] * 200
+    await client.aclose()
+
+
+async def test_redis_outage_is_a_503_not_an_anonymous_user(client, oauth_client):
+    # oauth_client leaves the test client logged in
+    assert (await client.get("/users/me")).status_code == 200
+
+    singleton = AsyncRedisSingleton()
+    working = singleton.conn
+    singleton.conn = redis.asyncio.Redis(port=1, socket_connect_timeout=0.1)
+    try:
+        response = await client.get("/users/me")
+    finally:
+        await singleton.conn.aclose()
+        singleton.conn = working
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Service temporarily unavailable"}
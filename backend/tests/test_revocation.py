@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from app.core.revocation import REVOKED_TOKENS_KEY, RevocationList
+from app.core.token_verifier import revoke_token
+from tests.flows import authorize
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_revoked_token_is_seen_by_other_workers(redis):
+    worker = RevocationList()
+    await worker.rebuild()
+    other = RevocationList()
+    await other.rebuild()
+
+    await worker.revoke("jti-1", int(time.time()) + 60)
+
+    assert await worker.is_revoked("jti-1")
+    assert not await other.is_revoked("jti-1")
+    await other.sync()
+    assert await other.is_revoked("jti-1")
+
+
+async def test_bloom_false_positive_falls_through_to_redis(redis):
+    worker = RevocationList()
+    await worker.rebuild()
+    # Stands in for a false positive: in the filter, never revoked
+    worker._bloom.add("jti-1")
+
+    assert "jti-1" in worker._bloom
+    assert not await worker.is_revoked("jti-1")
+
+
+async def test_expired_entries_are_pruned_on_rebuild(redis):
+    worker = RevocationList()
+    now = int(time.time())
+    await worker.revoke("live", now + 60)
+    await redis.zadd(REVOKED_TOKENS_KEY, {"expired": now - 1})
+
+    await worker.rebuild()
+
+    assert await redis.zrange(REVOKED_TOKENS_KEY, 0, -1) == ["live"]
+    assert "expired" not in worker._bloom
+    assert await worker.is_revoked("live")
+
+
+async def test_revoking_an_expired_token_stores_nothing(redis):
+    worker = RevocationList()
+    await worker.revoke("jti-1", int(time.time()) - 1)
+
+    assert await redis.zcard(REVOKED_TOKENS_KEY) == 0
+    assert not await worker.is_revoked("jti-1")
+
+
+async def test_revoked_access_token_introspects_as_inactive(client, oauth_client):
+    headers = {"Authorization": oauth_client["basic"]}
+    tokens = await authorize(client, oauth_client, "openid read")
+
+    response = await client.post(
+        "/token/introspect", json={"token": tokens["access_token"]}, headers=headers
+    )
+    assert response.json()["active"] is True
+
+    await revoke_token(tokens["access_token"])
+
+    response = await client.post(
+        "/token/introspect", json={"token": tokens["access_token"]}, headers=headers
+    )
+    assert response.json() == {"active": False}
@@ -0,0 +1,88 @@
+import secrets
+
+import httpx
+import pytest
+from sqlalchemy import func, insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_engine
+from app.core.scope_registry import ScopeRegistry, scope_registry
+from app.models.scope import Scope
+from app.models.user import User, UserRole
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def admin(app) -> httpx.AsyncClient:
+    """A client logged in as a freshly created admin."""
+    email = f"{secrets.token_hex(8)}@example.test"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.post("/auth/signup", json={"name": "Admin", "email": email, "password": "pw"})
+        async with AsyncSession(async_engine) as session:
+            await session.exec(
+                update(User).where(User.email == email).values(role=UserRole.ADMIN.value)
+            )
+            await session.commit()
+        # The session snapshot is taken at login
+        await client.post("/auth/login", json={"email": email, "password": "pw"})
+        yield client
+
+
+def _name() -> str:
+    return f"scope-{secrets.token_hex(4)}"
+
+
+async def test_admin_registers_a_scope(admin, client, oauth_client):
+    name = _name()
+
+    response = await admin.post("/scopes", json={"name": name, "description": "Test"})
+
+    assert response.status_code == 201, response.text
+    assert name in (await client.get("/scopes")).json()
+    discovery = (await client.get("/.well-known/openid-configuration")).json()
+    assert name in discovery["scopes_supported"]
+    assert scope_registry.bit(name)
+
+
+async def test_register_rejects_non_admins_duplicates_and_bad_names(admin, client, oauth_client):
+    name = _name()
+    assert (await client.post("/scopes", json={"name": name})).status_code == 403
+
+    assert (await admin.post("/scopes", json={"name": name})).status_code == 201
+    assert (await admin.post("/scopes", json={"name": name})).status_code == 409
+    assert (await admin.post("/scopes", json={"name": "two words"})).status_code == 422
+
+
+async def test_other_workers_pick_up_registered_scopes(app):
+    other = ScopeRegistry()
+    await other.load()
+    name = _name()
+
+    await scope_registry.register(name)
+    assert not other.bit(name)
+
+    await other.refresh()
+    assert other.bit(name)
+
+
+async def test_refresh_picks_up_scopes_inserted_outside_register(app):
+    worker = ScopeRegistry()
+    await worker.load()
+    generation = worker.generation
+    name = _name()
+
+    # As a migration or a manual insert would, without touching Redis
+    async with AsyncSession(async_engine) as session:
+        top = (await session.exec(select(func.max(Scope.bit)))).one()
+        await session.exec(insert(Scope).values(id=name, name=name, bit=top + 1))
+        await session.commit()
+
+    await worker.refresh()
+    assert worker.bit(name)
+    assert worker.generation == generation + 1
+
+    await worker.refresh()
+    assert worker.generation == generation + 1
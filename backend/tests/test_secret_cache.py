@@ -0,0 +1,29 @@
+from app.core.secret_cache import VerifiedSecretCache
+
+
+def test_invalidate_drops_cached_secrets():
+    cache = VerifiedSecretCache(max_size=8, ttl=60)
+    cache.remember("client", "secret", "hash")
+    assert cache.is_verified("client", "secret", "hash")
+    assert not cache.is_verified("client", "secret", "rotated-hash")
+
+    cache.invalidate("client")
+
+    assert not cache.is_verified("client", "secret", "hash")
+
+
+def test_per_client_state_stays_bounded():
+    cache = VerifiedSecretCache(max_size=8, ttl=60)
+    for n in range(100):
+        cache.remember(f"client-{n}", "secret", "hash")
+        cache.invalidate(f"client-{n}")
+        cache.invalidate(f"never-seen-{n}")
+
+    assert len(cache._salts) <= 8
+    assert len(cache._cache) <= 8
+    # Losing the salt of an invalidated client never brings its old entries back
+    cache.remember("client", "secret", "hash")
+    cache.invalidate("client")
+    for n in range(100):
+        cache.remember(f"other-{n}", "secret", "hash")
+    assert not cache.is_verified("client", "secret", "hash")
@@ -0,0 +1,77 @@
+import anyio
+import pytest
+
+from app.core.token_families import (
+    Rotation,
+    end_family,
+    rotate_family,
+    start_family,
+)
+from tests.flows import authorize
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_rotation_replaces_the_current_token(redis):
+    await start_family("family", "rt-1", ttl=60)
+
+    assert await rotate_family("family", "rt-1", "rt-2", ttl=60) is Rotation.ROTATED
+    assert await redis.get("rt_family:family") == "rt-2"
+    assert 0 < await redis.ttl("rt_family:family") <= 60
+
+
+async def test_reusing_a_rotated_token_drops_the_family(redis):
+    await start_family("family", "rt-1", ttl=60)
+    await rotate_family("family", "rt-1", "rt-2", ttl=60)
+
+    assert await rotate_family("family", "rt-1", "rt-3", ttl=60) is Rotation.REUSED
+    assert await redis.exists("rt_family:family") == 0
+    # The legitimate holder of rt-2 is cut off as well
+    assert await rotate_family("family", "rt-2", "rt-3", ttl=60) is Rotation.UNKNOWN_FAMILY
+
+
+async def test_expired_or_ended_family_is_unknown(redis):
+    await start_family("expired", "rt-1", ttl=60)
+    await redis.pexpire("rt_family:expired", 1)
+    await start_family("ended", "rt-1", ttl=60)
+    await end_family("ended")
+
+    await anyio.sleep(0.01)
+    assert await rotate_family("expired", "rt-1", "rt-2", ttl=60) is Rotation.UNKNOWN_FAMILY
+    assert await rotate_family("ended", "rt-1", "rt-2", ttl=60) is Rotation.UNKNOWN_FAMILY
+
+
+async def test_refresh_token_reuse_revokes_the_family(client, oauth_client):
+    headers = {"Authorization": oauth_client["basic"]}
+    first = await authorize(client, oauth_client, "openid read")
+
+    response = await client.post(
+        "/token",
+        json={"grant_type": "refresh_token", "refresh_token": first["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    second = response.json()
+    assert second["refresh_token"] != first["refresh_token"]
+
+    # Replaying the consumed refresh token
+    response = await client.post(
+        "/token",
+        json={"grant_type": "refresh_token", "refresh_token": first["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["error"] == "invalid_grant"
+
+    # Every token of the family is dead, including the ones issued after rotation
+    response = await client.post(
+        "/token",
+        json={"grant_type": "refresh_token", "refresh_token": second["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["error"] == "invalid_grant"
+
+    for token in (first["access_token"], second["access_token"]):
+        response = await client.post("/token/introspect", json={"token": token}, headers=headers)
+        assert response.json() == {"active": False}
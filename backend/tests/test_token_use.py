@@ -0,0 +1,61 @@
+import pytest
+
+from tests.flows import authorize
+
+pytestmark = pytest.mark.anyio
+
+
+async def _introspect(client, oauth_client, token: str) -> dict:
+    response = await client.post(
+        "/token/introspect", json={"token": token}, headers={"Authorization": oauth_client["basic"]}
+    )
+    return response.json()
+
+
+async def _refresh(client, oauth_client, refresh_token: str):
+    return await client.post(
+        "/token",
+        json={"grant_type": "refresh_token", "refresh_token": refresh_token},
+        headers={"Authorization": oauth_client["basic"]},
+    )
+
+
+async def test_only_access_tokens_are_bearer_tokens(client, oauth_client):
+    tokens = await authorize(client, oauth_client, "openid read")
+    # Cookies set by /token would otherwise authenticate every request
+    client.cookies.clear()
+
+    def bearer(token: str) -> dict:
+        return {"Authorization": f"Bearer {token}"}
+
+    assert (await client.get("/projects/", headers=bearer(tokens["access_token"]))).status_code == 200
+    for token in (tokens["refresh_token"], tokens["id_token"]):
+        assert (await client.get("/projects/", headers=bearer(token))).status_code == 401
+        assert (await client.get("/auth/userinfo", headers=bearer(token))).status_code == 401
+
+
+async def test_introspection_reports_refresh_tokens_as_such(client, oauth_client):
+    tokens = await authorize(client, oauth_client, "openid read")
+
+    result = await _introspect(client, oauth_client, tokens["refresh_token"])
+    assert result["active"] is True
+    assert result["token_type"] == "refresh_token"
+    assert (await _introspect(client, oauth_client, tokens["access_token"]))["token_type"] == "Bearer"
+
+    rotated = (await _refresh(client, oauth_client, tokens["refresh_token"])).json()
+
+    # Rotated away, but neither expired nor denylisted
+    assert await _introspect(client, oauth_client, tokens["refresh_token"]) == {"active": False}
+    assert (await _introspect(client, oauth_client, rotated["refresh_token"]))["active"] is True
+    assert await _introspect(client, oauth_client, tokens["id_token"]) == {"active": False}
+
+
+async def test_access_token_is_not_a_refresh_token(client, oauth_client):
+    tokens = await authorize(client, oauth_client, "openid read")
+
+    response = await _refresh(client, oauth_client, tokens["access_token"])
+    assert response.status_code == 400
+    assert response.json()["error"] == "invalid_grant"
+
+    # Rejected before rotation, so the family was not treated as reused
+    assert (await _refresh(client, oauth_client, tokens["refresh_token"])).status_code == 200
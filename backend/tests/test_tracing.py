@@ -0,0 +1,44 @@
+import json
+import threading
+
+import pytest
+
+from app.core.tracing import FileExporter, get_exporter, set_exporter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def file_exporter(tmp_path):
+    previous = get_exporter()
+    exporter = FileExporter(str(tmp_path / "traces.jsonl"), max_queue=2)
+    set_exporter(exporter)
+    yield exporter
+    set_exporter(previous)
+
+
+async def test_file_exporter_writes_spans_off_the_event_loop(client, file_exporter):
+    writers = []
+    write = file_exporter._write
+    file_exporter._write = lambda records: (writers.append(threading.current_thread()), write(records))
+
+    response = await client.get("/scopes")
+
+    file_exporter.flush()
+    assert writers and threading.current_thread() not in writers
+    with open(file_exporter.path, encoding="utf-8") as f:
+        spans = [json.loads(line) for line in f]
+    assert response.headers["x-trace-id"] in {s["trace_id"] for s in spans}
+    assert "GET /scopes" in {s["name"] for s in spans}
+
+
+async def test_file_exporter_drops_traces_when_the_writer_falls_behind(client, file_exporter):
+    unblock = threading.Event()
+    file_exporter._executor.submit(unblock.wait)
+
+    for _ in range(4):
+        await client.get("/scopes")
+    unblock.set()
+
+    file_exporter.flush()
+    assert file_exporter.dropped == 2